@@ -0,0 +1,190 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+## Utilitaires Selenium communs aux scrapers
+
+# Lecture de tout le tableau en un seul aller-retour WebDriver : on renvoie une
+# liste de lignes, chaque ligne étant la liste des textes de ses cellules.
+_READ_TABLE_JS = """
+const prop = arguments[1];
+return Array.from(document.querySelectorAll(arguments[0])).map(
+    row => Array.from(row.querySelectorAll('td')).map(td => (td[prop] || '').trim())
+);
+"""
+
+
+def read_table_rows(driver, selector="table tbody tr", prop="textContent"):
+    # prop : "textContent" (texte brut) ou "innerText" (texte affiché, = .text)
+    return driver.execute_script(_READ_TABLE_JS, selector, prop) or []
+
+
+## Attentes conditionnelles (à la place des time.sleep fixes)
+
+_FIRST_CELL_JS = """
+const cell = document.querySelector(arguments[0]);
+return cell ? cell.textContent.trim() : null;
+"""
+
+_TABLE_SHAPE_JS = """
+const rows = document.querySelectorAll(arguments[0]);
+return [rows.length, rows.length ? rows[0].querySelectorAll('td').length : 0];
+"""
+
+
+def first_cell_text(driver, selector="table tbody tr td:nth-child(2)"):
+    return driver.execute_script(_FIRST_CELL_JS, selector)
+
+
+def first_cell_changed(previous, selector="table tbody tr td:nth-child(2)"):
+    # Vrai dès que la première ligne affiche un autre joueur (changement de page)
+    def _condition(driver):
+        current = first_cell_text(driver, selector)
+        return bool(current) and current != previous
+
+    return _condition
+
+
+def table_settled(selector="table tbody tr", min_cells=1, settle=0.5):
+    # Vrai quand le nombre de lignes ne bouge plus pendant `settle` secondes
+    state = {"count": None, "since": 0.0}
+
+    def _condition(driver):
+        count, cells = driver.execute_script(_TABLE_SHAPE_JS, selector)
+        now = time.monotonic()
+        if count == 0 or cells < min_cells:
+            state["count"] = None
+            return False
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        return now - state["since"] >= settle
+
+    return _condition
+
+
+class WaitLog:
+    """Chronomètre les attentes d'une page pour mesurer la latence du site."""
+
+    def __init__(self, label):
+        self.label = label
+        self.steps = []
+        self.total = 0.0
+
+    def wait(self, driver, condition, timeout, step):
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition)
+        finally:
+            self.steps.append((step, time.perf_counter() - start))
+
+    def flush(self, page):
+        page_total = sum(t for _, t in self.steps)
+        self.total += page_total
+        detail = ", ".join(f"{step} {t:.2f}s" for step, t in self.steps)
+        print(f"[{self.label}] Page {page} – attente {page_total:.2f}s ({detail})")
+        self.steps = []
+
+
+## Pool de navigateurs pour le scraping parallèle
+
+
+class BrowserPool:
+    """Petit pool de sessions WebDriver réutilisables.
+
+    Une session qui plante est fermée et écartée ; la suivante est recréée à la
+    demande, sans relancer tout le scraping.
+    """
+
+    def __init__(self, factory, size=3):
+        self.factory = factory
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._drivers = []
+
+    @contextmanager
+    def session(self):
+        self._slots.acquire()
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self.factory()
+                with self._lock:
+                    self._drivers.append(driver)
+            try:
+                yield driver
+            except Exception:
+                self._discard(driver)
+                raise
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def scrape_pages(pool, pages, read_page, max_retries=3, label="Pool"):
+    # read_page(driver, page) -> liste de résultats ; renvoie {page: résultats}
+    # dans l'ordre des pages pour que la déduplication reste déterministe.
+    # Page abandonnée après max_retries : None (à ne pas confondre avec [],
+    # page lue mais vide)
+    def _task(page):
+        for attempt in range(1, max_retries + 1):
+            try:
+                with pool.session() as driver:
+                    return read_page(driver, page)
+            except Exception as e:
+                print(f"[{label}] Page {page} – erreur ({attempt}/{max_retries}) : {e}")
+        print(f"[{label}] Page {page} abandonnée.")
+        return None
+
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        return dict(zip(pages, executor.map(_task, pages)))
+
+
+def check_pages(pages, label="Pool"):
+    # Une page perdue fausserait la pagination et le jeu de données : on arrête
+    failed = [page for page, rows in pages.items() if rows is None]
+    if failed:
+        raise RuntimeError(
+            f"[{label}] Pages illisibles après plusieurs tentatives : {failed}"
+        )
+
+
+def parallel_arg(argv, default=3):
+    # --parallel (concurrence par défaut) ou --parallel=N ; 0 = mode séquentiel
+    for arg in argv:
+        if arg == "--parallel":
+            return default
+        if arg.startswith("--parallel="):
+            return int(arg.split("=", 1)[1])
+    return 0
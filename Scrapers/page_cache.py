@@ -0,0 +1,76 @@
+import json
+import os
+import re
+from datetime import date
+
+# Cache des pages brutes (lignes du tableau telles qu'extraites du site),
+# rangées par source et par jour : data/cache/<source>/<AAAA-MM-JJ>/page_001.json
+# Permet de rejouer le parsing hors ligne, sans navigateur.
+
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cache"
+)
+_DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_PAGE_RE = re.compile(r"^page_(\d+)\.json$")
+
+
+def _day_dir(source, day=None):
+    return os.path.join(CACHE_DIR, source, day or date.today().isoformat())
+
+
+def start_recording(source, day=None):
+    # Début d'un enregistrement : on vide le dossier du jour, sinon les pages
+    # d'une exécution précédente plus longue seraient rejouées avec celles-ci
+    folder = _day_dir(source, day)
+    if not os.path.isdir(folder):
+        return
+    for filename in os.listdir(folder):
+        if _PAGE_RE.match(filename):
+            os.remove(os.path.join(folder, filename))
+
+
+def save_page(source, page, rows, day=None):
+    folder = _day_dir(source, day)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"page_{page:03d}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def latest_day(source):
+    folder = os.path.join(CACHE_DIR, source)
+    if not os.path.isdir(folder):
+        return None
+    days = sorted(d for d in os.listdir(folder) if _DAY_RE.match(d))
+    return days[-1] if days else None
+
+
+def load_pages(source, day=None):
+    # {numéro de page: lignes}, dans l'ordre des pages ; jour le plus récent par défaut
+    day = day or latest_day(source)
+    if day is None:
+        return {}
+    folder = _day_dir(source, day)
+    if not os.path.isdir(folder):
+        return {}
+
+    pages = {}
+    for filename in os.listdir(folder):
+        match = _PAGE_RE.match(filename)
+        if match:
+            with open(os.path.join(folder, filename), encoding="utf-8") as f:
+                pages[int(match.group(1))] = json.load(f)
+    return dict(sorted(pages.items()))
+
+
+def replay_arg(argv):
+    # --replay (dernier jour en cache) ou --replay=AAAA-MM-JJ ; None = pas de rejeu
+    for arg in argv:
+        if arg == "--replay":
+            return ""
+        if arg.startswith("--replay="):
+            return arg.split("=", 1)[1]
+    return None
@@ -1,15 +1,35 @@
 import os
+import sys
 import time
 
 import pandas as pd
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.edge.options import Options
 from selenium.webdriver.edge.service import Service
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scrapers.browser_utils import (  # noqa: E402
+    BrowserPool,
+    WaitLog,
+    first_cell_changed,
+    first_cell_text,
+    parallel_arg,
+    read_table_rows,
+    scrape_pages,
+    table_settled,
+)
+from Scrapers.page_cache import (  # noqa: E402
+    load_pages,
+    replay_arg,
+    save_page,
+    start_recording,
+)
+from Scripts.excel_export import write_excel  # noqa: E402
+from Scripts.utils_nba import classify_contract  # noqa: E402
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 folder_path = os.path.join(os.path.dirname(script_dir), "data")
@@ -18,13 +38,19 @@ if not os.path.exists(folder_path):
 
 OUTPUT = os.path.join(folder_path, "NBA_Salary.xlsx")
 driver_filename = "msedgedriver.exe"
+SALARY_URL = "https://hoopshype.com/salaries/players/"
+SALARY_PAGE_URL = SALARY_URL + "?page={page}"
 
 ## Fonction utilitaire
 
 
-def _get_driver() -> webdriver.Edge:  # Configuration du driver
+def _get_driver(headless: bool = False) -> webdriver.Edge:  # Configuration du driver
     options = Options()
-    options.add_argument("--start-maximized")
+    if headless:  # Sessions du pool parallèle
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    else:
+        options.add_argument("--start-maximized")
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
@@ -46,71 +72,81 @@ def _get_driver() -> webdriver.Edge:  # Configuration du driver
     return driver
 
 
-# Onclassifie le type de contrat pour expliquer certains "bas" salaires (rookies)
-def classify_contract(
-    salary: int,
-) -> str:
-    if salary < 2_000_000:
-        return "Minimum / Two-Way"
-    if salary <= 16_000_000:
-        return "Rookie Scale"
-    if salary > 35_000_000:
-        return "Max / Supermax"
-    return "Standard"
+## Scraping
 
 
-## Scraping
+def parse_salary_rows(rows: list[list[str]]) -> list[dict]:
+    records = []
+    for cells in rows:
+        try:
+            if len(cells) < 3:
+                continue
+            name = cells[1].strip().split("\n")[0].split("(")[0].strip()
+            if not name:
+                continue
+            raw = cells[2].replace("$", "").replace(",", "").split("\n")[0].strip()
+            if raw.isdigit():
+                salary = int(raw)
+                records.append(
+                    {
+                        "Player": name,
+                        "Salary": salary,
+                        "Salary_Format": f"${salary:,}",
+                        "Contract_Type": classify_contract(salary),
+                    }
+                )
+        except Exception:
+            continue
+    return records
+
+
+def _dedupe(records: list[dict], seen: set[str]) -> list[dict]:
+    new = []
+    for record in records:
+        if record["Player"] in seen:
+            continue
+        seen.add(record["Player"])
+        new.append(record)
+    return new
+
+
+def _to_frame(records: list[dict]) -> pd.DataFrame:
+    if not records:
+        return pd.DataFrame()
+    df = (
+        pd.DataFrame(records)
+        .sort_values("Salary", ascending=False)
+        .reset_index(drop=True)
+    )
+    print(f"[Salary] ✔ {len(df)} joueurs récupérés")
+    return df
 
 
-def scrape_salaries(max_retries: int = 3) -> pd.DataFrame:
+def scrape_salaries(max_retries: int = 3, cache: bool = False) -> pd.DataFrame:
 
     records: list[dict] = []
     seen: set[str] = set()
+    if cache:
+        start_recording("salary")
 
-    def _read_page(driver, wait) -> list[dict]:
-        new = []
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")))
-        for r in driver.find_elements(By.CSS_SELECTOR, "table tbody tr"):
-            try:
-                cells = r.find_elements(By.TAG_NAME, "td")
-                if len(cells) < 3:
-                    continue
-                name = cells[1].text.strip().split("\n")[0].split("(")[0].strip()
-                if not name or name in seen:
-                    continue
-                raw = (
-                    cells[2]
-                    .text.replace("$", "")
-                    .replace(",", "")
-                    .split("\n")[0]
-                    .strip()
-                )
-                if raw.isdigit():
-                    salary = int(raw)
-                    new.append(
-                        {
-                            "Player": name,
-                            "Salary": salary,
-                            "Salary_Format": f"${salary:,}",
-                            "Contract_Type": classify_contract(salary),
-                        }
-                    )
-                    seen.add(name)
-            except Exception:
-                continue
-        return new
+    def _read_page(driver, waits, page) -> list[dict]:
+        rows = _wait_and_read(driver, waits)
+        waits.flush(page)
+        if cache:
+            save_page("salary", page, rows)
+        return _dedupe(parse_salary_rows(rows), seen)
 
     driver = _get_driver()
-    wait = WebDriverWait(driver, 25)
+    waits = WaitLog("Salary")
     consecutive_errors = 0
+    page = 1
 
     try:
-        driver.get("https://hoopshype.com/salaries/players/")
-        time.sleep(3)
+        driver.get(SALARY_URL)
 
         while True:
             try:
-                records.extend(_read_page(driver, wait))
+                records.extend(_read_page(driver, waits, page))
                 consecutive_errors = 0
             except Exception as e:
                 consecutive_errors += 1
@@ -124,11 +160,10 @@ def scrape_salaries(max_retries: int = 3) -> pd.DataFrame:
                     driver.quit()
                 except Exception:
                     pass
-                time.sleep(5)
+                time.sleep(5)  # Pause avant de relancer le navigateur
                 driver = _get_driver()
-                wait = WebDriverWait(driver, 25)
-                driver.get("https://hoopshype.com/salaries/players/")
-                time.sleep(4)
+                driver.get(SALARY_URL)
+                page = 1
                 continue
 
             print(f"[Salary] Joueurs collectés : {len(records)}")
@@ -142,8 +177,11 @@ def scrape_salaries(max_retries: int = 3) -> pd.DataFrame:
                 "a[rel='next']",
             ]:
                 try:
-                    btn = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+                    btn = waits.wait(
+                        driver,
+                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector)),
+                        5,
+                        "bouton suivant",
                     )
                     break
                 except Exception:
@@ -153,72 +191,123 @@ def scrape_salaries(max_retries: int = 3) -> pd.DataFrame:
                 print("[Salary] Fin de pagination.")
                 break
 
-            driver.execute_script("window.scrollTo(0, 1200);")
-            time.sleep(1)
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-            time.sleep(0.5)
+            first_player = first_cell_text(driver)
             driver.execute_script("arguments[0].click();", btn)
-            time.sleep(6)
+
+            # La page a changé quand le premier joueur affiché n'est plus le même
+            try:
+                waits.wait(driver, first_cell_changed(first_player), 20, "pagination")
+            except TimeoutException:
+                print("[Salary] La page suivante ne s'est pas chargée – arrêt.")
+                break
+            page += 1
 
     finally:
+        print(f"[Salary] Temps total d'attente du site : {waits.total:.1f}s")
         try:
             driver.quit()
         except Exception:
             pass
 
-    df = (
-        pd.DataFrame(records)
-        .sort_values("Salary", ascending=False)
-        .reset_index(drop=True)
-    )
-    print(f"[Salary] ✔ {len(df)} joueurs récupérés")
-    return df
+    return _to_frame(records)
 
 
-## Exportation et mise en page sous excel
+def _wait_and_read(driver, waits: WaitLog) -> list[list[str]]:
+    waits.wait(
+        driver,
+        EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")),
+        25,
+        "tableau",
+    )
+    try:
+        waits.wait(driver, table_settled(min_cells=3), 10, "lignes")
+    except TimeoutException:
+        print("[Salary] Tableau pas encore stable, lecture quand même.")
+    # Tout le tableau en un seul appel (innerText = équivalent de .text)
+    return read_table_rows(driver, prop="innerText")
+
+
+def _read_salary_page(driver, page: int) -> list[list[str]]:
+    waits = WaitLog("Salary")
+    driver.get(SALARY_PAGE_URL.format(page=page))
+    rows = _wait_and_read(driver, waits)
+    waits.flush(page)
+    return rows
+
+
+def scrape_salaries_parallel(
+    concurrency: int = 3,
+    max_pages: int = 40,
+    max_retries: int = 3,
+    cache: bool = False,
+) -> pd.DataFrame:
+    # Les pages sont demandées par lots de `concurrency` ; la pagination
+    # s'arrête à la première page lue qui n'apporte aucun nouveau joueur.
+    # Une page illisible (None) n'est pas une fin de pagination : si une page
+    # suivante apporte des joueurs, elle manque vraiment et on arrête tout
+    records: list[dict] = []
+    seen: set[str] = set()
+    failed: list[int] = []
+    if cache:
+        start_recording("salary")
+
+    with BrowserPool(lambda: _get_driver(headless=True), concurrency) as pool:
+        for start in range(1, max_pages + 1, pool.size):
+            batch = list(range(start, min(start + pool.size, max_pages + 1)))
+            pages = scrape_pages(
+                pool, batch, _read_salary_page, max_retries=max_retries, label="Salary"
+            )
+            finished = False
+            for page, rows in pages.items():
+                if rows is None:
+                    failed.append(page)
+                    continue
+                if cache and rows:
+                    save_page("salary", page, rows)
+                new = _dedupe(parse_salary_rows(rows), seen)
+                if not new:
+                    finished = True
+                    break
+                if failed:
+                    raise RuntimeError(
+                        f"[Salary] Pages illisibles avant la page {page} : {failed}"
+                    )
+                records.extend(new)
 
-HEADER_FILL = PatternFill("solid", start_color="1F4E79")
-HEADER_FONT = Font(bold=True, color="FFFFFF", name="Arial", size=10)
-ALT_FILL = PatternFill("solid", start_color="D6E4F0")
-BODY_FONT = Font(name="Arial", size=10)
-CENTER = Alignment(horizontal="center", vertical="center")
-THIN = Border(
-    left=Side(style="thin"),
-    right=Side(style="thin"),
-    top=Side(style="thin"),
-    bottom=Side(style="thin"),
-)
+            print(f"[Salary] Joueurs collectés : {len(records)}")
+            # Lot entièrement illisible : inutile d'aller plus loin
+            if finished or all(pages[page] is None for page in batch):
+                print("[Salary] Fin de pagination.")
+                break
 
+    if failed:
+        print(
+            f"[Salary] ⚠️ Pages illisibles en fin de pagination : {failed} "
+            "– le classement est peut-être incomplet."
+        )
+    return _to_frame(records)
 
-def style_sheet(ws, df: pd.DataFrame):
-    for col_idx, col_name in enumerate(df.columns, 1):
-        c = ws.cell(row=1, column=col_idx, value=col_name)
-        c.fill, c.font, c.alignment, c.border = HEADER_FILL, HEADER_FONT, CENTER, THIN
 
-    for row_idx, row in enumerate(df.itertuples(index=False), 2):
-        fill = ALT_FILL if row_idx % 2 == 0 else PatternFill()
-        for col_idx, value in enumerate(row, 1):
-            c = ws.cell(row=row_idx, column=col_idx, value=value)
-            c.font, c.alignment, c.border, c.fill = BODY_FONT, CENTER, THIN, fill
+def replay_salaries(day: str | None = None) -> pd.DataFrame:
+    # Reconstruction hors ligne à partir des pages brutes en cache, avec la
+    # même règle d'arrêt qu'à l'enregistrement
+    records: list[dict] = []
+    seen: set[str] = set()
+    for rows in load_pages("salary", day).values():
+        new = _dedupe(parse_salary_rows(rows), seen)
+        if not new:
+            break
+        records.extend(new)
+    if not records:
+        print("[Salary] Aucune page en cache.")
+    return _to_frame(records)
 
-    for col_idx, col_name in enumerate(df.columns, 1):
-        letter = get_column_letter(col_idx)
-        max_len = (
-            max(
-                df.iloc[:, col_idx - 1].fillna("").astype(str).map(len).max(),
-                len(col_name),
-            )
-            + 3
-        )
-        ws.column_dimensions[letter].width = min(max_len, 28)
 
-    ws.freeze_panes = "A2"
+## Exportation et mise en page sous excel
 
 
 def save(df: pd.DataFrame, filename: str = OUTPUT):
-    with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Salary", index=False)
-        style_sheet(writer.sheets["Salary"], df)
+    write_excel(df, filename, "Salary")
 
     top = df.iloc[0]
     print(f"\n{'=' * 55}")
@@ -233,10 +322,25 @@ def save(df: pd.DataFrame, filename: str = OUTPUT):
 
 
 if __name__ == "__main__":
-    df = scrape_salaries()
+    replay_day = replay_arg(sys.argv)
+    concurrency = parallel_arg(sys.argv)
+    cache = "--cache" in sys.argv
+
+    if replay_day is not None:
+        df = replay_salaries(replay_day)
+    elif concurrency:
+        df = scrape_salaries_parallel(concurrency, cache=cache)
+    else:
+        df = scrape_salaries(cache=cache)
 
     if df.empty:
         print("✘ Aucun salaire récupéré. Abandon.")
     else:
-        save(df)
+        from Scripts.storage import save_dataset
+
+        print(f"✔ Données sauvegardées : {save_dataset(df, 'NBA_Salary')}")
+
+        # Export Excel mis en forme : optionnel
+        if "--excel" in sys.argv:
+            save(df)
         print("✔ Terminé !")
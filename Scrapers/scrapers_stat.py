@@ -1,24 +1,50 @@
 import os
-import time
+import sys
 
 import pandas as pd
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.edge.options import Options
 from selenium.webdriver.edge.service import Service
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.ui import Select
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scrapers.browser_utils import (  # noqa: E402
+    BrowserPool,
+    WaitLog,
+    check_pages,
+    first_cell_changed,
+    first_cell_text,
+    parallel_arg,
+    read_table_rows,
+    scrape_pages,
+    table_settled,
+)
+from Scrapers.page_cache import (  # noqa: E402
+    load_pages,
+    replay_arg,
+    save_page,
+    start_recording,
+)
 
 driver_filename = "msedgedriver.exe"
+STATS_URL = "https://www.nba.com/stats/players/traditional?PerMode=PerGame"
+PLAYER_LINK = 'table tbody tr td a[href*="/stats/player/"]'
+MIN_STAT_CELLS = 26  # Une ligne joueur complète (cf. Player)
 
 ## Fonction utilitaire
 
 
-def _get_driver():  # Configuration du dirver
+def _get_driver(headless=False):  # Configuration du dirver
     options = Options()
-    options.add_argument("--start-maximized")
+    if headless:  # Sessions du pool parallèle
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    else:
+        options.add_argument("--start-maximized")
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
@@ -87,22 +113,76 @@ class Player:  # Définition de toute les stats
         return self.__dict__
 
 
-def scrap_nba_stat():
+def parse_stat_rows(rows, debug=False):
+    players = []
+    for i, data_row in enumerate(rows):
+        try:
+            if len(data_row) > 25:
+                # Debug :
+                if debug and i == 0:
+                    print(
+                        f"🔍 PREMIER JOUEUR DÉTECTÉ : {data_row[1]} (Équipe: {data_row[2]})"
+                    )
+
+                if len(data_row) > 1 and data_row[1] != "":
+                    players.append(Player(data_row))
+        except Exception:
+            continue
+    return players
+
+
+def _accept_cookies(driver, waits, timeout):
+    bypasscookie = waits.wait(
+        driver,
+        EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler")),
+        timeout,
+        "bannière cookies",
+    )
+    bypasscookie.click()
+    waits.wait(
+        driver,
+        EC.invisibility_of_element_located((By.ID, "onetrust-banner-sdk")),
+        5,
+        "cookies",
+    )
+
+
+def _dismiss_cookies(driver, waits):
+    # Sans attente : sur une session réutilisée, la bannière est déjà acceptée
+    buttons = driver.find_elements(By.ID, "onetrust-accept-btn-handler")
+    if buttons and buttons[0].is_displayed():
+        buttons[0].click()
+        waits.wait(
+            driver,
+            EC.invisibility_of_element_located((By.ID, "onetrust-banner-sdk")),
+            5,
+            "cookies",
+        )
+
+
+def _wait_full_table(driver, waits):
+    # Scroll pour bien faire apparaitre toutes les statistiques, puis on attend
+    # que le nombre de lignes se stabilise
+    driver.execute_script("window.scrollTo(0, 500)")
+    try:
+        waits.wait(driver, table_settled(min_cells=MIN_STAT_CELLS), 10, "tableau")
+    except TimeoutException:
+        print("⚠️ Tableau pas encore stable, lecture quand même.")
+
+
+def scrap_nba_stat(cache=False):
     driver = _get_driver()
-    wait = WebDriverWait(driver, 20)
-    urlpage = "https://www.nba.com/stats/players/traditional?PerMode=PerGame"
-    all_player_data = []
+    waits = WaitLog("Stats")
+    pages = {}
+    if cache:
+        start_recording("stats")
 
     try:
-        driver.get(urlpage)
+        driver.get(STATS_URL)
 
         # Autorisation des cookies
         try:
-            bypasscookie = wait.until(
-                EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
-            )
-            bypasscookie.click()
-            time.sleep(2)
+            _accept_cookies(driver, waits, 20)
         except Exception:
             print("Info: Cookies ignorés.")
 
@@ -110,52 +190,26 @@ def scrap_nba_stat():
             print(f"\n--- Chargement de la page {page} ---")
 
             try:
-                wait.until(
+                waits.wait(
+                    driver,
                     EC.presence_of_element_located(
-                        (
-                            By.CSS_SELECTOR,
-                            'table tbody tr td a[href*="/stats/player/"]',
-                        )  # Attende de l'apparatition des joueurs
-                    )
+                        (By.CSS_SELECTOR, PLAYER_LINK)
+                    ),  # Attende de l'apparatition des joueurs
+                    20,
+                    "joueurs",
                 )
             except Exception:
                 print("⚠️ Timeout : Les vrais joueurs ne sont pas apparus.")
                 break
 
-            driver.execute_script(
-                "window.scrollTo(0, 500)"
-            )  # Scroll pour bien faire apparaitre toutes les statistiques
-            time.sleep(3)
-
-            # Extraction
-            rows = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-            page_count = 0
-
-            for i, r in enumerate(rows):
-                try:
-                    cells = r.find_elements(By.TAG_NAME, "td")
-                    if len(cells) > 25:
-                        data_row = []
-                        for c in cells:
-                            raw_text = c.get_attribute(
-                                "textContent"
-                            )  # On force la lecture du texte
-                            clean_text = raw_text.strip() if raw_text else ""
-                            data_row.append(clean_text)
-
-                        # Debug :
-                        if page == 1 and i == 0:
-                            print(
-                                f"🔍 PREMIER JOUEUR DÉTECTÉ : {data_row[1]} (Équipe: {data_row[2]})"
-                            )
-
-                        if len(data_row) > 1 and data_row[1] != "":
-                            all_player_data.append(Player(data_row))
-                            page_count += 1
-                except Exception:
-                    continue
-
-            print(f"Joueurs collectés sur la page : {page_count}")
+            _wait_full_table(driver, waits)
+
+            # Extraction : tout le tableau en un seul appel (textContent forcé)
+            rows = read_table_rows(driver)
+            if cache:
+                save_page("stats", page, rows)
+            pages[page] = rows
+            waits.flush(page)
 
             # Pagination (Changement de page)
             try:
@@ -170,79 +224,166 @@ def scrap_nba_stat():
                     print("🏁 Dernière page atteinte.")
                     break
 
-                driver.execute_script("arguments[0].scrollIntoView(true);", next_pg)
-                time.sleep(1)
-
+                first_player = first_cell_text(driver)
                 driver.execute_script("arguments[0].click();", next_pg)
                 print(f"Passage à la page {page + 1}...")
-                time.sleep(6)
 
+                # La page a changé quand le premier joueur affiché n'est plus le même
+                waits.wait(driver, first_cell_changed(first_player), 20, "pagination")
+
+            except TimeoutException:
+                print("⚠️ La page suivante ne s'est pas chargée. Fin de l'extraction.")
+                break
             except Exception as e:
                 print(
                     f"⚠️ Bouton Suivant introuvable. Fin de l'extraction. (Erreur: {e})"
                 )
                 break
-        return all_player_data
+        # Même fusion (dédupliquée par nom) qu'en mode parallèle et au rejeu
+        return _merge_stat_pages(pages)
     finally:
+        print(f"⏱️ Temps total d'attente du site : {waits.total:.1f}s")
         driver.quit()
 
 
-## Exportation et mise en page sous excel
+def _stats_session():
+    # Session du pool : bannière des cookies acceptée une fois, à la création
+    driver = _get_driver(headless=True)
+    waits = WaitLog("Stats")
+    try:
+        driver.get(STATS_URL)
+    except Exception:
+        driver.quit()
+        raise
+    try:
+        _accept_cookies(driver, waits, 20)
+    except Exception:
+        print("[Stats] Info: cookies ignorés pour cette session.")
+    waits.flush("session")
+    return driver
 
 
-def style_excel(path, df):
-    with pd.ExcelWriter(path, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Stats", index=False)
-        ws = writer.sheets["Stats"]
+def _read_stats_page(driver, page):
+    waits = WaitLog("Stats")
+    driver.get(STATS_URL)
+
+    waits.wait(
+        driver,
+        EC.presence_of_element_located((By.CSS_SELECTOR, PLAYER_LINK)),
+        20,
+        "joueurs",
+    )
+    _dismiss_cookies(driver, waits)
 
-        header_fill = PatternFill("solid", start_color="1A2A4A")
-        header_font = Font(bold=True, color="FFFFFF")
-        alt_fill = PatternFill("solid", start_color="D6E4F0")
-        border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
+    # Accès direct à la page via le menu déroulant de pagination
+    if page > 1:
+        dropdown = Select(
+            driver.find_element(
+                By.CSS_SELECTOR, "div[class*='Pagination_pageDropdown'] select"
+            )
         )
+        if str(page) not in [o.text.strip() for o in dropdown.options]:
+            return []  # Page inexistante : fin du classement
+        first_player = first_cell_text(driver)
+        dropdown.select_by_visible_text(str(page))
+        waits.wait(driver, first_cell_changed(first_player), 20, "pagination")
 
-        for col_idx in range(1, len(df.columns) + 1):
-            c = ws.cell(row=1, column=col_idx)
-            c.fill, c.font, c.border = header_fill, header_font, border
-            ws.column_dimensions[get_column_letter(col_idx)].width = 16
+    _wait_full_table(driver, waits)
+    rows = read_table_rows(driver)
+    waits.flush(page)
+    return rows
 
-        for row_idx in range(2, ws.max_row + 1):
-            fill = alt_fill if row_idx % 2 == 0 else PatternFill()
-            for col_idx in range(1, len(df.columns) + 1):
-                c = ws.cell(row=row_idx, column=col_idx)
-                c.fill, c.border = fill, border
-                c.alignment = Alignment(horizontal="center")
 
-        ws.freeze_panes = "A2"
+def _merge_stat_pages(pages):
+    all_player_data = []
+    seen = set()
+    for page, rows in pages.items():
+        new = 0
+        for player in parse_stat_rows(rows, debug=page == 1):
+            if player.Player in seen:
+                continue
+            seen.add(player.Player)
+            all_player_data.append(player)
+            new += 1
+        print(f"Joueurs collectés sur la page {page} : {new}")
+    return all_player_data
+
+
+def scrap_nba_stat_parallel(concurrency=3, max_pages=11, max_retries=3, cache=False):
+    # Chaque session du pool ouvre directement sa page : les pages sont
+    # récupérées en même temps puis fusionnées dans l'ordre
+    with BrowserPool(_stats_session, concurrency) as pool:
+        pages = scrape_pages(
+            pool,
+            list(range(1, max_pages + 1)),
+            _read_stats_page,
+            max_retries=max_retries,
+            label="Stats",
+        )
+    check_pages(pages, "Stats")
 
+    if cache:
+        start_recording("stats")
+        for page, rows in pages.items():
+            if rows:
+                save_page("stats", page, rows)
+    return _merge_stat_pages(pages)
 
-# Lancement du scrap
 
-if __name__ == "__main__":
-    data = scrap_nba_stat()
+def replay_nba_stat(day=None):
+    # Reconstruction hors ligne à partir des pages brutes en cache
+    pages = load_pages("stats", day)
+    if not pages:
+        print("❌ Aucune page en cache pour les stats.")
+    return _merge_stat_pages(pages)
 
-    if data:
-        df = pd.DataFrame([p.to_dict() for p in data])
 
-        # Calcul du ratio AST/TOV, et W%
-        df["AST_TOV_Ratio"] = df.apply(
-            lambda x: (
-                round(x["Assists"] / x["Turnovers"], 2) if x["Turnovers"] > 0 else 0
-            ),
-            axis=1,
-        )
+## Sauvegarde (commune au scraper Selenium et au client JSON)
 
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        folder_path = os.path.join(os.path.dirname(script_dir), "data")
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
 
-        final_path = os.path.join(folder_path, "NBA_Stat.xlsx")
-        style_excel(final_path, df)
-        print(f"\n🎉 EXCEL SAUVEGARDÉ ! Total : {len(df)} joueurs dans {final_path}")
-    else:
+def build_stat_frame(players):
+    df = pd.DataFrame([p.to_dict() for p in players])
+
+    # Calcul du ratio AST/TOV, et W%
+    df["AST_TOV_Ratio"] = df.apply(
+        lambda x: (
+            round(x["Assists"] / x["Turnovers"], 2) if x["Turnovers"] > 0 else 0
+        ),
+        axis=1,
+    )
+    return df
+
+
+def save_stats(players, excel=False):
+    if not players:
         print("\n❌ ÉCHEC : 0 joueurs récupérés.")
+        return None
+
+    df = build_stat_frame(players)
+
+    from Scripts.excel_export import write_excel
+    from Scripts.storage import dataset_path, save_dataset
+
+    final_path = save_dataset(df, "NBA_Stat")
+    print(f"\n🎉 DONNÉES SAUVEGARDÉES ! Total : {len(df)} joueurs dans {final_path}")
+
+    # Export Excel mis en forme : optionnel
+    if excel:
+        write_excel(df, dataset_path("NBA_Stat", "xlsx"), "Stats", header_color="1A2A4A")
+    return df
+
+
+# Lancement du scrap
+
+if __name__ == "__main__":
+    replay_day = replay_arg(sys.argv)
+    concurrency = parallel_arg(sys.argv)
+    cache = "--cache" in sys.argv
+
+    if replay_day is not None:
+        data = replay_nba_stat(replay_day)
+    elif concurrency:
+        data = scrap_nba_stat_parallel(concurrency, cache=cache)
+    else:
+        data = scrap_nba_stat(cache=cache)
+    save_stats(data, excel="--excel" in sys.argv)
@@ -0,0 +1,176 @@
+import os
+import sys
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scrapers.scrapers_stat import Player, save_stats  # noqa: E402
+
+# Client HTTP direct : le tableau de nba.com/stats est rempli côté navigateur à
+# partir de cet endpoint JSON, on l'interroge donc sans passer par Selenium.
+# L'URL de base est surchargeable (serveur local qui rejoue des fixtures).
+STATS_API_URL = os.environ.get("NBA_STATS_API_URL", "https://stats.nba.com/stats")
+SEASON = "2025-26"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Origin": "https://www.nba.com",
+    "Referer": "https://www.nba.com/",
+    "x-nba-stats-origin": "stats",
+    "x-nba-stats-token": "true",
+}
+
+# Paramètres identiques à ceux envoyés par la page "traditional?PerMode=PerGame"
+BASE_PARAMS = {
+    "College": "",
+    "Conference": "",
+    "Country": "",
+    "DateFrom": "",
+    "DateTo": "",
+    "Division": "",
+    "DraftPick": "",
+    "DraftYear": "",
+    "GameScope": "",
+    "GameSegment": "",
+    "Height": "",
+    "LastNGames": 0,
+    "LeagueID": "00",
+    "Location": "",
+    "MeasureType": "Base",
+    "Month": 0,
+    "OpponentTeamID": 0,
+    "Outcome": "",
+    "PORound": 0,
+    "PaceAdjust": "N",
+    "PerMode": "PerGame",
+    "Period": 0,
+    "PlayerExperience": "",
+    "PlayerPosition": "",
+    "PlusMinus": "N",
+    "Rank": "N",
+    "SeasonSegment": "",
+    "SeasonType": "Regular Season",
+    "ShotClockRange": "",
+    "StarterBench": "",
+    "TeamID": 0,
+    "VsConference": "",
+    "VsDivision": "",
+    "Weight": "",
+}
+
+# Colonne JSON correspondant à chaque colonne du tableau HTML lu par Player
+# (None = colonne non utilisée, *_PCT = pourcentages affichés sur 100)
+ROW_LAYOUT = [
+    None,  # Rang
+    "PLAYER_NAME",
+    "TEAM_ABBREVIATION",
+    "AGE",
+    "GP",
+    "W",
+    "L",
+    "MIN",
+    "PTS",
+    "FGM",
+    "FGA",
+    "FG_PCT",
+    "FG3M",
+    "FG3A",
+    "FG3_PCT",
+    "FTM",
+    "FTA",
+    "FT_PCT",
+    "OREB",
+    "DREB",
+    "REB",
+    "AST",
+    "TOV",
+    "STL",
+    "BLK",
+    "PF",
+    "NBA_FANTASY_PTS",
+    "DD2",
+    "TD3",
+    "PLUS_MINUS",
+]
+PCT_COLUMNS = {"FG_PCT", "FG3_PCT", "FT_PCT"}
+
+
+def _get_session(pool_size: int = 4) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    # On réessaie sur les erreurs réseau et les erreurs serveur, pas sur les 4xx
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code >= 500
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+@retry(
+    retry=retry_if_exception(_is_retryable),
+    stop=stop_after_attempt(4),
+    wait=wait_exponential(multiplier=0.5, max=8),
+    reraise=True,
+)
+def _get_json(session: requests.Session, url: str, params: dict) -> dict:
+    response = session.get(url, params=params, timeout=(5, 30))
+    response.raise_for_status()
+    return response.json()
+
+
+def _format_cell(key: str, value) -> str:
+    # Même rendu que le tableau HTML : une décimale, pourcentages sur 100
+    if value is None:
+        return ""
+    if key in PCT_COLUMNS:
+        return f"{float(value) * 100:.1f}"
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def to_data_row(record: dict) -> list[str]:
+    return ["" if key is None else _format_cell(key, record.get(key)) for key in ROW_LAYOUT]
+
+
+def fetch_nba_stat(
+    base_url: str = STATS_API_URL,
+    season: str = SEASON,
+    session: requests.Session | None = None,
+) -> list[Player]:
+    session = session or _get_session()
+    payload = _get_json(
+        session,
+        f"{base_url.rstrip('/')}/leaguedashplayerstats",
+        {**BASE_PARAMS, "Season": season},
+    )
+
+    result = payload["resultSets"][0]
+    headers = result["headers"]
+    players = []
+    for values in result["rowSet"]:
+        record = dict(zip(headers, values))
+        if record.get("PLAYER_NAME"):
+            players.append(Player(to_data_row(record)))
+
+    print(f"[API] Joueurs récupérés : {len(players)}")
+    return players
+
+
+if __name__ == "__main__":
+    save_stats(fetch_nba_stat(), excel="--excel" in sys.argv)
@@ -0,0 +1,41 @@
+import threading
+import time
+
+
+class DatasetSnapshot:
+    """Version figée du jeu de données servie par l'application.
+
+    Un rafraîchissement construit un nouveau snapshot puis remplace l'ancien
+    d'un coup : une requête en cours garde toujours une vue cohérente.
+    """
+
+    def __init__(self, df, version, load_seconds=0.0):
+        self.df = df
+        self.version = version
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self._derived = {}
+        self._lock = threading.RLock()  # Un builder peut s'appuyer sur un autre
+
+    def derived(self, key, builder):
+        """Structure dérivée (index, agrégats...) calculée une fois par version."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = builder(self.df)
+            return self._derived[key]
+
+
+def name_index(snapshot):
+    """Nom du joueur -> première ligne du jeu de données (une fois par version)."""
+
+    def build(df):
+        index = {}
+        for pos, name in enumerate(df["Player"]):
+            index.setdefault(name, pos)
+        return index
+
+    return snapshot.derived("name_index", build)
@@ -0,0 +1,120 @@
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+# Export Excel commun (stats, salaires, données finales) en mode write-only :
+# les lignes sont écrites au fil de l'eau, sans garder la feuille en mémoire.
+# La mise en forme passe par trois styles nommés (en-tête, ligne paire, ligne
+# impaire) déclarés une seule fois dans le classeur, et reste optionnelle.
+
+HEADER_COLOR = "1F4E79"
+ALT_COLOR = "D6E4F0"
+FONT_NAME = "Arial"
+MAX_WIDTH = 28
+WIDTH_SAMPLE = 1000  # Lignes utilisées pour estimer la largeur des colonnes
+CHUNK_ROWS = 2000
+
+THIN = Side(style="thin")
+
+
+def _named_styles(header_color, font_name):
+    border = Border(left=THIN, right=THIN, top=THIN, bottom=THIN)
+    center = Alignment(horizontal="center", vertical="center")
+    body_font = Font(name=font_name, size=10)
+
+    return [
+        NamedStyle(
+            name="nba_header",
+            font=Font(name=font_name, size=10, bold=True, color="FFFFFF"),
+            fill=PatternFill("solid", start_color=header_color),
+            alignment=center,
+            border=border,
+        ),
+        NamedStyle(
+            name="nba_even",
+            font=body_font,
+            fill=PatternFill("solid", start_color=ALT_COLOR),
+            alignment=center,
+            border=border,
+        ),
+        NamedStyle(name="nba_odd", font=body_font, alignment=center, border=border),
+    ]
+
+
+def _column_widths(df, max_width=MAX_WIDTH):
+    # Largeur estimée sur un échantillon : le coût ne dépend pas du nombre de lignes
+    sample = df.head(WIDTH_SAMPLE)
+    widths = []
+    for col in df.columns:
+        longest = sample[col].fillna("").astype(str).str.len().max()
+        longest = 0 if pd.isna(longest) else int(longest)
+        widths.append(min(max(longest, len(str(col))) + 3, max_width))
+    return widths
+
+
+def _chunks(df):
+    # Valeurs Python par blocs (NaN -> cellule vide, comme to_excel)
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df.iloc[start : start + CHUNK_ROWS]
+        yield chunk.astype(object).where(chunk.notna(), None).itertuples(index=False)
+
+
+def write_excel(
+    df,
+    path,
+    sheet_name="Sheet1",
+    styled=True,
+    header_color=HEADER_COLOR,
+    font_name=FONT_NAME,
+):
+    """Écrit df dans path (une feuille) ; styled=False = valeurs brutes uniquement."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+    columns = list(df.columns)
+
+    if not styled:
+        ws.append([str(c) for c in columns])
+        for rows in _chunks(df):
+            for row in rows:
+                ws.append(row)
+    else:
+        for style in _named_styles(header_color, font_name):
+            wb.add_named_style(style)
+        for idx, width in enumerate(_column_widths(df), 1):
+            ws.column_dimensions[get_column_letter(idx)].width = width
+        ws.freeze_panes = "A2"
+
+        header = []
+        for col in columns:
+            cell = WriteOnlyCell(ws, value=str(col))
+            cell.style = "nba_header"
+            header.append(cell)
+        ws.append(header)
+
+        # Une rangée de cellules stylées par bande (paire / impaire), réutilisée :
+        # en write-only chaque ligne est sérialisée dès l'append
+        bands = []
+        for name in ("nba_even", "nba_odd"):
+            band = []
+            for _ in columns:
+                cell = WriteOnlyCell(ws)
+                cell.style = name
+                band.append(cell)
+            bands.append(band)
+
+        row_idx = 2
+        for rows in _chunks(df):
+            for row in rows:
+                band = bands[row_idx % 2]
+                for cell, value in zip(band, row):
+                    cell.value = value
+                ws.append(band)
+                row_idx += 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    wb.save(path)
+    return path
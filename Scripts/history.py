@@ -0,0 +1,170 @@
+import bisect
+import os
+import re
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from Scripts import storage
+
+# Historique des snapshots nba_data, partitionné par jour :
+# data/history/date=AAAA-MM-JJ/nba_data.arrow (Arrow IPC non compressé).
+# Les jours passés ne sont jamais réécrits ; seul le jour courant peut être
+# remplacé si les données changent dans la journée. Les partitions sont
+# mappées en mémoire et gardées ouvertes : une requête ne lit que les jours
+# et les colonnes demandés.
+
+HISTORY_DIR = os.path.join(storage.DATA_DIR, "history")
+HISTORY_COLUMNS = [
+    "Team",
+    "Performance_Score",
+    "Salary_th",
+    "Salary",
+    "Indicateur",
+    "Offensive_Impact",
+    "Defensive_Impact",
+]
+
+class HistoryError(ValueError):
+    pass
+
+
+_PARTITION_RE = re.compile(r"^date=(\d{4}-\d{2}-\d{2})$")
+_lock = threading.Lock()
+_listing = {"mtime": None, "days": []}
+_tables = {}  # chemin -> (mtime_ns, pa.Table mappée)
+_combined_cache = {}
+
+
+def partition_path(day):
+    return os.path.join(HISTORY_DIR, f"date={day}", "nba_data.arrow")
+
+
+def append_snapshot(df, day=None, replace=True):
+    """Écrit le snapshot du jour ; replace=False garde la partition existante."""
+    day = day or date.today().isoformat()
+    path = partition_path(day)
+    if os.path.exists(path) and not replace:
+        return None
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def list_days():
+    # Liste des jours mise en cache tant que le dossier ne change pas
+    try:
+        mtime = os.stat(HISTORY_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    with _lock:
+        if _listing["mtime"] != mtime:
+            days = []
+            for entry in os.listdir(HISTORY_DIR):
+                match = _PARTITION_RE.match(entry)
+                if match:
+                    days.append(match.group(1))
+            _listing["mtime"], _listing["days"] = mtime, sorted(days)
+        return _listing["days"]
+
+
+def _open_partition(day):
+    path = partition_path(day)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _tables.get(path)
+    if cached and cached[0] == mtime:
+        return cached
+    # Le mapping reste valide après fermeture du fichier
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    _tables[path] = (mtime, table)
+    return _tables[path]
+
+
+def _combined():
+    """Toutes les partitions mises bout à bout (sans copie) + bornes par jour.
+
+    Reconstruit seulement quand un jour apparaît ou que le jour courant change :
+    les jours passés sont immuables.
+    """
+    days = list_days()
+    with _lock:
+        latest = _open_partition(days[-1]) if days else None
+        key = (tuple(days), latest[0] if latest else None)
+        if _combined_cache.get("key") == key:
+            return _combined_cache["value"]
+
+        tables, kept, offsets = [], [], [0]
+        for day in days:
+            partition = _open_partition(day)
+            if partition is None:
+                continue
+            tables.append(partition[1])
+            kept.append(day)
+            offsets.append(offsets[-1] + partition[1].num_rows)
+        # Colonnes absentes de certains snapshots : complétées par des nulls
+        if not tables:
+            value = (None, None, kept, np.asarray(offsets))
+        else:
+            table = pa.concat_tables(tables, promote_options="permissive")
+            # Copie contiguë des colonnes usuelles (quelques Mo) : recherche et
+            # extraction sans parcourir un morceau par jour
+            usual = [c for c in ["Player", *HISTORY_COLUMNS] if c in table.schema.names]
+            dense = table.select(usual).combine_chunks()
+            value = (table, dense, kept, np.asarray(offsets))
+        _combined_cache.update(key=key, value=value)
+        return value
+
+
+def _day(value):
+    # Date ISO (AAAA-MM-JJ), normalisée pour la comparaison avec les partitions
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise HistoryError(f"Invalid date: {value}") from None
+
+
+def player_history(name, start=None, end=None, columns=None):
+    """Trajectoire d'un joueur : une ligne par jour, entre start et end inclus."""
+    start, end = _day(start), _day(end)
+    # Date est toujours la première colonne : pas de doublon si elle est demandée
+    columns = [c for c in columns or HISTORY_COLUMNS if c != "Date"]
+    table, dense, days, offsets = _combined()
+    if table is None:
+        return pd.DataFrame(columns=["Date", *columns])
+    # Colonnes usuelles absentes des snapshots conservés : vides, pas d'erreur
+    known = set(table.schema.names) | set(HISTORY_COLUMNS)
+    unknown = [c for c in columns if c not in known]
+    if unknown:
+        raise HistoryError(f"Unknown column: {', '.join(unknown)}")
+    present = [c for c in columns if c in table.schema.names]
+    if all(c in dense.schema.names for c in present):
+        table = dense
+
+    # Élagage des partitions : seules les lignes des jours demandés sont lues
+    first = bisect.bisect_left(days, start) if start else 0
+    last = max(bisect.bisect_right(days, end) if end else len(days), first)
+    lo, hi = offsets[first], offsets[last]
+    window = table.slice(lo, hi - lo)
+
+    mask = pc.equal(window["Player"], name).to_numpy(zero_copy_only=False)
+    rows = np.flatnonzero(mask)
+    df = window.select(present).take(rows).to_pandas()
+    positions = np.searchsorted(offsets, rows + lo, "right") - 1
+    df.insert(0, "Date", [days[i] for i in positions])
+    return df.reindex(columns=["Date", *columns])
@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import threading
+
+from cachetools import LRUCache
+
+try:
+    import brotli
+except ImportError:  # Optionnel : gzip seulement
+    brotli = None
+
+# Cache HTTP : page pré-rendue et pré-compressée, réponses JSON compressées et
+# validées par ETag. L'ETag d'une réponse d'API ne dépend que de la version du
+# jeu de données et de l'URL : un 304 est renvoyé sans recalculer le corps, et
+# les corps déjà produits (par encodage) sont gardés dans un cache LRU borné.
+
+MIN_COMPRESS_BYTES = 1024  # En dessous, la compression ne vaut pas l'en-tête
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+RESPONSE_CACHE_SIZE = 512
+
+_responses = LRUCache(maxsize=RESPONSE_CACHE_SIZE)
+_responses_lock = threading.Lock()
+
+
+def compress(body, encoding, static=False):
+    # Compression maximale pour la page (une seule fois), rapide pour l'API
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if static else BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9 if static else GZIP_LEVEL, mtime=0)
+    return body
+
+
+def accepted_encoding(accept_encoding):
+    """Meilleur encodage accepté par le client : br, puis gzip, sinon identity."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Comparaison faible : W/"x" et "x" désignent la même représentation
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return etag.removeprefix("W/") in tags
+
+
+class StaticPage:
+    """Corps d'une page fixe, encodé une fois par variante au démarrage."""
+
+    def __init__(self, html):
+        body = html.encode("utf-8")
+        # ETag faible : même représentation quel que soit l'encodage
+        self.etag = 'W/"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        self.bodies = {"identity": body, "gzip": compress(body, "gzip", static=True)}
+        if brotli is not None:
+            self.bodies["br"] = compress(body, "br", static=True)
+
+    def body(self, encoding):
+        return self.bodies.get(encoding, self.bodies["identity"])
+
+
+def api_etag(version, full_path):
+    digest = hashlib.sha1(full_path.encode("utf-8")).hexdigest()[:12]
+    return f'W/"{version}-{digest}"'
+
+
+def cached_body(etag, accepted):
+    """(corps, Content-Encoding) déjà produit pour cet ETag et ce client, ou None."""
+    with _responses_lock:
+        return _responses.get((etag, accepted))
+
+
+def store_body(etag, accepted, body, encoding):
+    with _responses_lock:
+        _responses[(etag, accepted)] = (body, encoding)
+
+
+def clear_responses():
+    with _responses_lock:
+        _responses.clear()
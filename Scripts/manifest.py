@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from Scripts import storage
+
+# Manifeste des empreintes (hash de contenu) des entrées, paramètres et sorties
+# de la fusion : une relance avec des entrées identiques ne fait rien.
+
+MANIFEST_PATH = os.path.join(storage.DATA_DIR, "manifest.json")
+
+
+def row_hashes(df):
+    """Empreinte 64 bits de chaque ligne (indépendante de l'index)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def frame_hash(df):
+    h = hashlib.sha256()
+    h.update("|".join(map(str, df.columns)).encode("utf-8"))
+    h.update(row_hashes(df).tobytes())
+    return h.hexdigest()
+
+
+def params_hash(params):
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    os.makedirs(storage.DATA_DIR, exist_ok=True)
+    tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def record_output(manifest, name, df):
+    manifest.setdefault("outputs", {})[name] = {
+        "hash": frame_hash(df),
+        "version": storage.dataset_version(name),
+    }
+
+
+def output_unchanged(manifest, name):
+    """Vrai si la sortie sur disque est toujours celle enregistrée au manifeste."""
+    recorded = manifest.get("outputs", {}).get(name)
+    if not recorded:
+        return False
+    version = storage.dataset_version(name)
+    if version is None:
+        return False
+    if version == recorded.get("version"):
+        return True
+    # Fichier réécrit depuis : on compare le contenu
+    return frame_hash(storage.load_dataset(name)) == recorded.get("hash")
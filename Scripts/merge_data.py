@@ -1,17 +1,24 @@
 import os
 import sys
 import unicodedata
-
-import pandas as pd
+from functools import lru_cache
 
 # Path setup for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+
+
 def clean_name(text):
     """Normalisation ultime : pas d'accents, pas de ponctuation, pas de suffixes."""
     if not isinstance(text, str):
         return ""
+    return _clean_name(text)
+
+
+@lru_cache(maxsize=65536)
+def _clean_name(text):
     # Passage en minuscule et retrait ponctuation
     text = text.lower().replace(".", "").replace("-", " ").replace("'", " ").strip()
     # Retrait des accents (Dončić -> Doncic)
@@ -19,85 +26,201 @@ def clean_name(text):
         c for c in unicodedata.normalize("NFD", text) if unicodedata.category(c) != "Mn"
     )
     # Retrait des suffixes Jr, Sr, II, III, IV
-    words = text.split()
-    suffixes = {"jr", "sr", "ii", "iii", "iv"}
-    words = [w for w in words if w not in suffixes]
+    words = [w for w in text.split() if w not in SUFFIXES]
     return " ".join(words)
 
 
-def refresh_nba_data():
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    stats_path = os.path.join(BASE_DIR, "data", "NBA_Stat.xlsx")
-    salary_path = os.path.join(BASE_DIR, "data", "NBA_Salary.xlsx")
-    output_path = os.path.join(BASE_DIR, "data", "nba_data.xlsx")
-
-    df_stats = pd.read_excel(stats_path)
-    df_salary = pd.read_excel(salary_path)
-
-    # Création d'un dictionnaire de recherche normalisé
-    # Clé = nom nettoyé, Valeur = (Salaire, Type, Nom Original)
-    salary_dict = {}
-    for _, row in df_salary.iterrows():
-        orig_name = str(row["Player"])
-        salary_dict[clean_name(orig_name)] = {
-            "val": row["Salary"],
-            "type": row.get("Contract_Type", "Standard"),
-            "first": clean_name(orig_name).split()[0]
-            if len(clean_name(orig_name).split()) > 0
-            else "",
-        }
-
-    final_salaries = []
-    final_types = []
-
-    for _, row in df_stats.iterrows():
-        name = str(row["Player"])
-        c_name = clean_name(name)
-        parts = c_name.split()
-
-        found_sal = 0
-        found_type = "Standard"
-
-        # 1. Match Direct Normalisé (KAT, Michael Porter Jr, Trey Murphy III)
-        if c_name in salary_dict:
-            found_sal = salary_dict[c_name]["val"]
-            found_type = salary_dict[c_name]["type"]
-
-        # 2. Match par Initiales (V. Wembanyama -> Victor Wembanyama)
-        else:
-            for norm_key, data in salary_dict.items():
-                key_parts = norm_key.split()
-                if len(parts) >= 2 and len(key_parts) >= 2:
-                    # On compare le Nom de famille et l'initiale du prénom
-                    if parts[-1] == key_parts[-1] and parts[0][0] == key_parts[0][0]:
-                        # SECURITÉ HOMONYMES : Si le prénom complet est présent et différent, on ignore
-                        # (Ex: Bronny vs LeBron : l'initiale 'b' != 'l', donc pas de match)
-                        if (
-                            len(parts[0]) > 1
-                            and len(key_parts[0]) > 1
-                            and parts[0] != key_parts[0]
-                        ):
-                            continue
-                        found_sal = data["val"]
-                        found_type = data["type"]
-                        break
-
-        final_salaries.append(found_sal)
-        final_types.append(found_type)
+def build_salary_index(df_salary):
+    """Index de recherche construits une seule fois.
+
+    - exact : nom nettoyé -> (Salaire, Type)
+    - initials : (nom de famille, initiale du prénom) -> [(prénom, Salaire, Type)]
+      dans l'ordre du fichier, pour le match "V. Wembanyama"
+    """
+    names = df_salary["Player"].astype(str).map(clean_name)
+    types = (
+        df_salary["Contract_Type"]
+        if "Contract_Type" in df_salary.columns
+        else ["Standard"] * len(df_salary)
+    )
+
+    exact = {}
+    for c_name, val, c_type in zip(names, df_salary["Salary"], types):
+        exact[c_name] = (val, c_type)
+
+    initials = {}
+    for c_name, (val, c_type) in exact.items():
+        key_parts = c_name.split()
+        if len(key_parts) >= 2:
+            key = (key_parts[-1], key_parts[0][0])
+            initials.setdefault(key, []).append((key_parts[0], val, c_type))
+    return exact, initials
+
+
+def match_salary(c_name, exact, initials):
+    # 1. Match Direct Normalisé (KAT, Michael Porter Jr, Trey Murphy III)
+    if c_name in exact:
+        return exact[c_name]
+
+    # 2. Match par Initiales (V. Wembanyama -> Victor Wembanyama)
+    parts = c_name.split()
+    if len(parts) >= 2:
+        # On compare le Nom de famille et l'initiale du prénom
+        for first, val, c_type in initials.get((parts[-1], parts[0][0]), ()):
+            # SECURITÉ HOMONYMES : Si le prénom complet est présent et différent, on ignore
+            # (Ex: Bronny vs LeBron : l'initiale 'b' != 'l', donc pas de match)
+            if len(parts[0]) > 1 and len(first) > 1 and parts[0] != first:
+                continue
+            return val, c_type
+
+    return 0, "Standard"
+
+
+def merge_salaries(df_stats, df_salary):
+    df_stats = df_stats.copy()
+    exact, initials = build_salary_index(df_salary)
+
+    matches = [
+        match_salary(c_name, exact, initials)
+        for c_name in df_stats["Player"].astype(str).map(clean_name)
+    ]
+    final_salaries = [m[0] for m in matches]
+    final_types = [m[1] for m in matches]
 
     df_stats["Salary"] = final_salaries
     df_stats["Contract_Type"] = final_types
+    return df_stats
+
+
+def merge_salaries_incremental(df_stats, df_salary, previous):
+    """Ne re-matche que les lignes de stats qui ont changé depuis la fusion précédente.
 
-    # Calcul des métriques
-    from Scripts.utils_nba import compute_metrics
+    `previous` doit avoir été fusionné avec le même fichier de salaires.
+    Renvoie (fusion, nombre de lignes re-matchées).
+    """
+    from Scripts.manifest import row_hashes
 
-    df_final = compute_metrics(df_stats)
+    stat_cols = list(df_stats.columns)
+    if previous is None or previous.empty or not set(stat_cols) <= set(previous.columns):
+        return merge_salaries(df_stats, df_salary), len(df_stats)
 
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        df_final.to_excel(writer, sheet_name="Analyse_NBA", index=False)
+    known = dict(
+        zip(
+            row_hashes(previous[stat_cols]),
+            zip(previous["Salary"], previous["Contract_Type"]),
+        )
+    )
+    current = row_hashes(df_stats)
+    changed = sum(1 for h in current if h not in known)
+    exact, initials = build_salary_index(df_salary) if changed else ({}, {})
+
+    matches = [
+        known[h] if h in known else match_salary(clean_name(name), exact, initials)
+        for h, name in zip(current, df_stats["Player"].astype(str))
+    ]
+    df_merged = df_stats.copy()
+    df_merged["Salary"] = [m[0] for m in matches]
+    df_merged["Contract_Type"] = [m[1] for m in matches]
+    return df_merged, changed
+
+
+def load_merge_inputs():
+    from Scripts import storage
+
+    df_stats = storage.load_dataset("NBA_Stat")
+    df_salary = storage.load_dataset(
+        "NBA_Salary", columns=["Player", "Salary", "Contract_Type"]
+    )
+    return df_stats, df_salary
+
+
+def merge_step(force=False):
+    """Fusion stats + salaires pilotée par le manifeste.
+
+    Renvoie (fusion, modifiée ?) : rien n'est réécrit si les entrées n'ont pas
+    changé depuis la dernière exécution.
+    """
+    from Scripts import manifest as mf
+    from Scripts import storage
+
+    df_stats, df_salary = load_merge_inputs()
+    manifest = mf.load_manifest()
+    inputs = {
+        "NBA_Stat": mf.frame_hash(df_stats),
+        "NBA_Salary": mf.frame_hash(df_salary),
+    }
+    previous_inputs = manifest.get("inputs", {})
+    # nba_merged réécrit hors pipeline : ni réutilisable, ni base d'une fusion
+    # incrémentale
+    reusable = (
+        not force
+        and previous_inputs.get("NBA_Salary") == inputs["NBA_Salary"]
+        and mf.output_unchanged(manifest, "nba_merged")
+    )
 
-    print("Files created")
+    if reusable and previous_inputs == inputs:
+        print("Merge inputs unchanged")
+        return storage.load_dataset("nba_merged"), False
+
+    # Même fichier de salaires : seules les lignes de stats modifiées sont re-matchées
+    if reusable:
+        previous = storage.load_dataset("nba_merged")
+        df_merged, changed = merge_salaries_incremental(df_stats, df_salary, previous)
+    else:
+        df_merged, changed = merge_salaries(df_stats, df_salary), len(df_stats)
+    print(f"Players re-matched: {changed}/{len(df_stats)}")
+
+    storage.save_dataset(df_merged, "nba_merged")
+    manifest["inputs"] = inputs
+    mf.record_output(manifest, "nba_merged", df_merged)
+    mf.save_manifest(manifest)
+    return df_merged, True
+
+
+def metrics_step(df_merged=None, force=False, export_excel=False):
+    """Métriques de ligue (normalisation globale) sur la fusion, via le manifeste."""
+    from Scripts import manifest as mf
+    from Scripts import storage
+    from Scripts.utils_nba import compute_metrics, metrics_params
+
+    if df_merged is None:
+        df_merged = storage.load_dataset("nba_merged")
+    manifest = mf.load_manifest()
+    key = {
+        "nba_merged": mf.frame_hash(df_merged),
+        "params": mf.params_hash(metrics_params()),
+    }
+
+    if (
+        not force
+        and manifest.get("metrics") == key
+        and mf.output_unchanged(manifest, "nba_data")
+    ):
+        print("Metrics inputs unchanged")
+        df_final = storage.load_dataset("nba_data")
+        if export_excel:
+            storage.export_excel(df_final, "nba_data", styled=export_excel == "styled")
+        return df_final, False
+
+    df_final = compute_metrics(df_merged)
+    storage.save_dataset(df_final, "nba_data")
+    if export_excel:
+        storage.export_excel(df_final, "nba_data", styled=export_excel == "styled")
+
+    manifest["metrics"] = key
+    mf.record_output(manifest, "nba_data", df_final)
+    mf.save_manifest(manifest)
+    return df_final, True
+
+
+def refresh_nba_data(export_excel=False, force=False):
+    df_merged, _ = merge_step(force)
+    _, computed = metrics_step(df_merged, force, export_excel)
+
+    print("Files created" if computed else "Nothing to do")
 
 
 if __name__ == "__main__":
-    refresh_nba_data()
+    # --excel : export brut, --excel=styled : export mis en forme
+    excel = "styled" if "--excel=styled" in sys.argv else "--excel" in sys.argv
+    refresh_nba_data(export_excel=excel, force="--force" in sys.argv)
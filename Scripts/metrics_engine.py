@@ -0,0 +1,201 @@
+import numbers
+import os
+import sys
+
+import numpy as np
+from sortedcontainers import SortedList
+
+# Path setup for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scripts.utils_nba import (  # noqa: E402
+    MAX_SALARY_FLOOR,
+    compute_metrics,
+    finalize_scores,
+    league_maxima,
+    normalize_stats,
+    prepare_stats,
+    raw_scores,
+)
+
+# Moteur incrémental : garde les maxima de la ligue et les classements dans des
+# listes triées, pour qu'une mise à jour de la ligne d'un joueur ne recalcule
+# que ce joueur et les rangs qui bougent. Si un maximum de la ligue change,
+# toutes les valeurs normalisées changent : on repasse par compute_metrics.
+# Le résultat est identique à un compute_metrics complet.
+
+# Colonne de rang -> clé triée qui la détermine
+RANK_KEYS = {
+    "Rank_Points": "Points",
+    "Rank_Assists": "Assists",
+    "Rank_Rebounds": "Total_Rebounds",
+    "Rank_Defense": "Defense",
+}
+
+# Maxima servant à la normalisation des stats (premier niveau)
+STAT_MAX_KEYS = [
+    "Points",
+    "Assists",
+    "Total_Rebounds",
+    "Steals",
+    "Blocks",
+    "Plus_Minus",
+    "Salary",
+]
+
+# Maxima des scores bruts (calculés après normalisation)
+SCORE_MAX_KEYS = ["off_raw", "def_raw", "performance"]
+
+_INF = float("inf")
+
+
+def _stat_keys(df):
+    return {
+        "Points": df["Points"].to_numpy(dtype=float),
+        "Assists": df["Assists"].to_numpy(dtype=float),
+        "Total_Rebounds": df["Total_Rebounds"].to_numpy(dtype=float),
+        "Steals": df["Steals"].to_numpy(dtype=float),
+        "Blocks": df["Blocks"].to_numpy(dtype=float),
+        "Defense": (df["Steals"] + df["Blocks"]).to_numpy(dtype=float),
+        "Plus_Minus": np.abs(df["Plus_Minus"]).to_numpy(dtype=float),
+        "Salary": df["Salary"].to_numpy(dtype=float),
+    }
+
+
+def _score_keys(off_raw, def_raw, performance):
+    return {
+        "off_raw": np.asarray(off_raw, dtype=float),
+        "def_raw": np.asarray(def_raw, dtype=float),
+        "performance": np.asarray(performance, dtype=float),
+    }
+
+
+class IncrementalMetrics:
+    def __init__(self, df_merged):
+        self.full_recomputes = 0
+        self._rebuild(df_merged.reset_index(drop=True))
+
+    def _rebuild(self, base):
+        self.base = base
+        self.df = compute_metrics(base)
+        self.full_recomputes += 1
+
+        prepared = prepare_stats(base)
+        self.maxima = league_maxima(prepared)
+        normalize_stats(prepared, self.maxima)
+        keys = _stat_keys(prepared)
+        keys.update(_score_keys(*raw_scores(prepared)))
+
+        self._values = keys
+        self._sorted = {
+            key: SortedList(zip(values, range(len(values))))
+            for key, values in keys.items()
+        }
+        # Des NaN rendraient l'ordre des listes triées incohérent
+        self._exact = not any(np.isnan(v).any() for v in keys.values())
+        self._positions = {}
+        for pos, name in enumerate(base["Player"]):
+            self._positions.setdefault(name, pos)
+
+    def _max(self, key):
+        return self._sorted[key][-1][0]
+
+    def _move(self, key, pos, new_value):
+        old_value = self._values[key][pos]
+        if old_value == new_value:
+            return old_value
+        self._sorted[key].remove((old_value, pos))
+        self._sorted[key].add((new_value, pos))
+        self._values[key][pos] = new_value
+        return old_value
+
+    def _update_rank(self, column, key, pos, old_value, new_value):
+        if old_value == new_value:
+            return
+        ranks = self.df[column].to_numpy()
+        sorted_values = self._sorted[key]
+
+        # Rang = 1 + nombre de joueurs strictement meilleurs : seuls ceux entre
+        # l'ancienne et la nouvelle valeur voient leur rang bouger d'une place
+        if new_value > old_value:
+            lo, hi, step = old_value, new_value, 1
+        else:
+            lo, hi, step = new_value, old_value, -1
+        moved = [
+            other
+            for _, other in sorted_values.irange((lo, -1), (hi, -1), (True, False))
+            if other != pos
+        ]
+        ranks[np.asarray(moved, dtype=np.intp)] += step
+
+        better = len(sorted_values) - sorted_values.bisect_right((new_value, _INF))
+        ranks[pos] = better + 1
+        self.df[column] = ranks
+
+    def apply_delta(self, player, changes):
+        """Applique les nouvelles stats d'un joueur ; renvoie sa ligne recalculée."""
+        # Position (int Python ou numpy) ou nom du joueur
+        if isinstance(player, numbers.Integral):
+            pos = int(player)
+        else:
+            pos = self._positions[player]
+        for column, value in changes.items():
+            self.base.iloc[pos, self.base.columns.get_loc(column)] = value
+
+        if not self._exact:
+            self._rebuild(self.base)
+            return self.df.iloc[pos]
+
+        row = prepare_stats(self.base.iloc[[pos]])
+        stat_keys = _stat_keys(row)
+        old_maxima = {key: self._max(key) for key in STAT_MAX_KEYS}
+        old_values = {key: self._move(key, pos, v[0]) for key, v in stat_keys.items()}
+        if any(self._max(key) != old_maxima[key] for key in STAT_MAX_KEYS):
+            self._rebuild(self.base)
+            return self.df.iloc[pos]
+
+        normalize_stats(row, self.maxima)
+        off_raw, def_raw, performance = raw_scores(row)
+        score_keys = _score_keys(off_raw, def_raw, performance)
+        old_score_maxima = {key: self._max(key) for key in SCORE_MAX_KEYS}
+        for key, v in score_keys.items():
+            self._move(key, pos, v[0])
+        if (
+            any(self._max(key) != old_score_maxima[key] for key in SCORE_MAX_KEYS)
+            or any(np.isnan(v[0]) for v in score_keys.values())
+            or old_score_maxima["performance"] <= 0
+        ):
+            self._rebuild(self.base)
+            return self.df.iloc[pos]
+
+        finalize_scores(
+            row,
+            off_raw,
+            def_raw,
+            performance,
+            old_score_maxima["off_raw"],
+            old_score_maxima["def_raw"],
+            old_score_maxima["performance"],
+            max(old_maxima["Salary"], MAX_SALARY_FLOOR),
+        )
+
+        for column, key in RANK_KEYS.items():
+            self._update_rank(column, key, pos, old_values[key], stat_keys[key][0])
+            row[column] = self.df[column].iat[pos]
+
+        for j, column in enumerate(self.df.columns):
+            self.df.iat[pos, j] = row[column].iat[0]
+        return self.df.iloc[pos]
+
+    def apply_deltas(self, deltas):
+        # deltas : {joueur: {colonne: valeur}}
+        for player, changes in deltas.items():
+            self.apply_delta(player, changes)
+        return self.df
+
+
+if __name__ == "__main__":
+    from Scripts.storage import load_dataset
+
+    engine = IncrementalMetrics(load_dataset("nba_merged"))
+    print(f"[Metrics] Moteur prêt : {len(engine.df)} joueurs")
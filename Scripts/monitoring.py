@@ -0,0 +1,243 @@
+import cProfile
+import io
+import pstats
+import random
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Instrumentation de l'application : compteurs et histogrammes de latence par
+# route, jauges sur le jeu de données et le dernier rafraîchissement, rendus
+# au format texte Prometheus (sans dépendance externe).
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        value = value.replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _value(value):
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def metric(name, kind, help_text, samples):
+    """Bloc texte d'une métrique.
+
+    samples : [(labels, valeur)] ou [(suffixe, labels, valeur)] pour les histogrammes
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for sample in samples:
+        suffix, labels, value = sample if len(sample) == 3 else ("", *sample)
+        lines.append(f"{name}{suffix}{_labels(labels)} {_value(value)}")
+    return lines
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def samples(self, labels):
+        cumulative = 0
+        out = []
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            out.append(("_bucket", {**labels, "le": repr(bound)}, cumulative))
+        out.append(("_bucket", {**labels, "le": "+Inf"}, self.count))
+        out.append(("_sum", labels, self.sum))
+        out.append(("_count", labels, self.count))
+        return out
+
+
+class RequestMetrics:
+    """Nombre de requêtes et latence par route (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}  # (route, méthode, statut) -> nombre
+        self.latency = {}  # (route, méthode) -> Histogram
+
+    def observe(self, route, method, status, seconds):
+        with self._lock:
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if (route, method) not in self.latency:
+                self.latency[(route, method)] = Histogram()
+            self.latency[(route, method)].observe(seconds)
+
+    def render(self):
+        with self._lock:
+            counts = [
+                ({"route": r, "method": m, "status": s}, n)
+                for (r, m, s), n in sorted(self.requests.items())
+            ]
+            histograms = []
+            for (r, m), hist in sorted(self.latency.items()):
+                histograms.extend(hist.samples({"route": r, "method": m}))
+        return metric(
+            "nba_http_requests_total", "counter", "Requêtes HTTP traitées.", counts
+        ) + metric(
+            "nba_http_request_duration_seconds",
+            "histogram",
+            "Latence des requêtes HTTP par route.",
+            histograms,
+        )
+
+
+def dataset_metrics(snapshot):
+    df = snapshot.df
+    memory = snapshot.derived(
+        "memory_bytes", lambda d: int(d.memory_usage(deep=True).sum())
+    )
+    lines = []
+    lines += metric(
+        "nba_dataset_info",
+        "gauge",
+        "Version du jeu de données servi.",
+        [({"version": snapshot.version or "none"}, 1)],
+    )
+    lines += metric(
+        "nba_dataset_rows", "gauge", "Joueurs dans le jeu de données.", [({}, len(df))]
+    )
+    lines += metric(
+        "nba_dataset_load_seconds",
+        "gauge",
+        "Durée du dernier chargement du jeu de données.",
+        [({}, snapshot.load_seconds)],
+    )
+    lines += metric(
+        "nba_dataset_age_seconds",
+        "gauge",
+        "Temps écoulé depuis le chargement du jeu de données.",
+        [({}, time.time() - snapshot.loaded_at)],
+    )
+    lines += metric(
+        "nba_dataset_memory_bytes",
+        "gauge",
+        "Empreinte mémoire du DataFrame servi.",
+        [({}, memory)],
+    )
+    if resource is not None:
+        # ru_maxrss est en Ko sous Linux
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        lines += metric(
+            "nba_process_max_rss_bytes",
+            "gauge",
+            "Pic de mémoire résidente du processus.",
+            [({}, rss)],
+        )
+    return lines
+
+
+def refresh_metrics(state):
+    return (
+        metric(
+            "nba_refresh_last_duration_seconds",
+            "gauge",
+            "Durée du dernier check_and_update_data.",
+            [({}, state.get("seconds"))],
+        )
+        + metric(
+            "nba_refresh_last_success",
+            "gauge",
+            "1 si le dernier rafraîchissement a réussi.",
+            [({}, state.get("success"))],
+        )
+        + metric(
+            "nba_refresh_last_timestamp_seconds",
+            "gauge",
+            "Fin du dernier rafraîchissement (epoch).",
+            [({}, state.get("finished_at"))],
+        )
+        + metric(
+            "nba_refresh_failures_total",
+            "counter",
+            "Rafraîchissements en échec.",
+            [({}, state.get("failures", 0))],
+        )
+    )
+
+
+def pipeline_metrics(report):
+    seconds = [
+        ({"stage": r["stage"], "status": r["status"]}, r["seconds"]) for r in report
+    ]
+    rows = [({"stage": r["stage"]}, r["rows"]) for r in report if r["rows"] is not None]
+    return metric(
+        "nba_pipeline_stage_seconds",
+        "gauge",
+        "Durée de chaque étape du dernier pipeline.",
+        seconds,
+    ) + metric(
+        "nba_pipeline_stage_rows",
+        "gauge",
+        "Lignes produites par étape au dernier pipeline.",
+        rows,
+    )
+
+
+class SamplingProfiler:
+    """Profile (cProfile) une fraction des requêtes sur les routes choisies."""
+
+    def __init__(self, routes, rate=0.01):
+        self.routes = set(routes)
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._stats = {}  # route -> pstats.Stats cumulées
+        self._samples = {}
+
+    def start(self, route):
+        if route not in self.routes or random.random() >= self.rate:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # Un autre profileur est déjà actif sur ce thread
+            return None
+        return profile
+
+    def stop(self, route, profile):
+        profile.disable()
+        with self._lock:
+            if route in self._stats:
+                self._stats[route].add(profile)
+            else:
+                self._stats[route] = pstats.Stats(profile)
+            self._samples[route] = self._samples.get(route, 0) + 1
+
+    def report(self, route, limit=30):
+        with self._lock:
+            stats = self._stats.get(route)
+            if stats is None:
+                return f"Aucun échantillon pour {route}\n"
+            out = io.StringIO()
+            stats.stream = out
+            out.write(f"{route} : {self._samples[route]} requêtes échantillonnées\n")
+            stats.sort_stats("cumulative").print_stats(limit)
+            return out.getvalue()
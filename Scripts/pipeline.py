@@ -0,0 +1,228 @@
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+# Path setup for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scripts import storage  # noqa: E402
+
+# Orchestrateur du rafraîchissement : petit graphe de dépendances exécuté dans
+# le même processus. Les deux scrapers tournent en parallèle, une étape dont
+# les sorties sont à jour est sautée, et chaque étape est chronométrée.
+# Statuts : ran, skipped (sorties plus récentes que les entrées), unchanged
+# (contenu identique d'après le manifeste), failed, blocked (amont en échec).
+
+LAST_REPORT = []
+
+
+class Unchanged(Exception):
+    """Levée par une étape qui a vérifié que ses sorties étaient déjà à jour."""
+
+    def __init__(self, rows=None):
+        super().__init__("unchanged")
+        self.rows = rows
+
+
+class Stage:
+    def __init__(self, name, func, outputs, inputs=(), deps=()):
+        self.name = name
+        self.func = func  # func() -> DataFrame produit (pour le nombre de lignes)
+        self.outputs = list(outputs)
+        self.inputs = list(inputs)
+        self.deps = list(deps)
+
+    def is_fresh(self):
+        out_mtimes = [storage.dataset_mtime(name) for name in self.outputs]
+        if any(m is None for m in out_mtimes):
+            return False
+
+        # Étape source (scraping) : à jour si déjà exécutée aujourd'hui
+        if not self.inputs:
+            today = datetime.now().date()
+            return all(datetime.fromtimestamp(m).date() >= today for m in out_mtimes)
+
+        # Étape dérivée : à jour si ses sorties sont plus récentes que ses entrées
+        in_mtimes = [storage.dataset_mtime(name) for name in self.inputs]
+        if any(m is None for m in in_mtimes):
+            return False
+        return min(out_mtimes) >= max(in_mtimes)
+
+
+## Étapes
+
+
+def _scrape_stats():
+    from Scrapers import scrapers_stat
+
+    source = os.environ.get("NBA_STATS_SOURCE", "selenium")
+    if source == "api":
+        from Scrapers.scrapers_stat_api import fetch_nba_stat
+
+        players = fetch_nba_stat()
+    elif source == "replay":
+        players = scrapers_stat.replay_nba_stat()
+    else:
+        concurrency = int(os.environ.get("NBA_SCRAPER_CONCURRENCY", 0))
+        if concurrency:
+            players = scrapers_stat.scrap_nba_stat_parallel(concurrency)
+        else:
+            players = scrapers_stat.scrap_nba_stat()
+
+    df = scrapers_stat.save_stats(players)
+    if df is None:
+        raise RuntimeError("0 joueurs récupérés")
+    return df
+
+
+def _scrape_salary():
+    from Scrapers import scrapers_salary
+
+    source = os.environ.get("NBA_SALARY_SOURCE", "selenium")
+    concurrency = int(os.environ.get("NBA_SCRAPER_CONCURRENCY", 0))
+    if source == "replay":
+        df = scrapers_salary.replay_salaries()
+    elif concurrency:
+        df = scrapers_salary.scrape_salaries_parallel(concurrency)
+    else:
+        df = scrapers_salary.scrape_salaries()
+
+    if df.empty:
+        raise RuntimeError("Aucun salaire récupéré")
+    storage.save_dataset(df, "NBA_Salary")
+    return df
+
+
+def _merge():
+    from Scripts.merge_data import merge_step
+
+    df, changed = merge_step()
+    if not changed:
+        raise Unchanged(len(df))
+    return df
+
+
+def _compute_metrics():
+    from Scripts import history
+    from Scripts.merge_data import metrics_step
+
+    # NBA_EXPORT_EXCEL=1 : export brut (rapide), NBA_EXPORT_EXCEL=styled : mis en forme
+    export = os.environ.get("NBA_EXPORT_EXCEL", "")
+    df, changed = metrics_step(export_excel="styled" if export == "styled" else bool(export))
+
+    # Snapshot du jour dans l'historique (le jour courant est remplacé s'il a changé)
+    history.append_snapshot(df, replace=changed)
+    if not changed:
+        raise Unchanged(len(df))
+    return df
+
+
+def build_stages():
+    return [
+        Stage("scrape_stats", _scrape_stats, outputs=["NBA_Stat"]),
+        Stage("scrape_salary", _scrape_salary, outputs=["NBA_Salary"]),
+        Stage(
+            "merge",
+            _merge,
+            outputs=["nba_merged"],
+            inputs=["NBA_Stat", "NBA_Salary"],
+            deps=["scrape_stats", "scrape_salary"],
+        ),
+        Stage(
+            "compute_metrics",
+            _compute_metrics,
+            outputs=["nba_data"],
+            inputs=["nba_merged"],
+            deps=["merge"],
+        ),
+    ]
+
+
+## Exécution
+
+
+def _report(stage, status, seconds=0.0, rows=None, error=None):
+    if rows is None and status == "skipped":
+        rows = storage.dataset_rows(stage.outputs[0])
+    return {
+        "stage": stage.name,
+        "status": status,
+        "seconds": round(seconds, 3),
+        "rows": rows,
+        "error": error,
+    }
+
+
+def _run_stage(stage):
+    start = time.perf_counter()
+    try:
+        df = stage.func()
+    except Unchanged as e:
+        return _report(stage, "unchanged", time.perf_counter() - start, e.rows)
+    except Exception as e:
+        return _report(stage, "failed", time.perf_counter() - start, error=str(e))
+    rows = len(df) if df is not None else None
+    return _report(stage, "ran", time.perf_counter() - start, rows)
+
+
+def run_pipeline(stages=None, force=False, max_workers=2):
+    global LAST_REPORT
+    stages = stages if stages is not None else build_stages()
+    pending = list(stages)
+    status = {}
+    reports = []
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            progress = True
+            while progress:
+                progress = False
+                for stage in list(pending):
+                    dep_status = [status.get(dep) for dep in stage.deps]
+                    if None in dep_status:
+                        continue  # Dépendances pas encore terminées
+                    pending.remove(stage)
+                    progress = True
+
+                    if any(s in ("failed", "blocked") for s in dep_status):
+                        report = _report(stage, "blocked")
+                    elif not force and "ran" not in dep_status and stage.is_fresh():
+                        report = _report(stage, "skipped")
+                    else:
+                        running[executor.submit(_run_stage, stage)] = stage
+                        continue
+                    status[stage.name] = report["status"]
+                    reports.append(report)
+
+            if not running:
+                if pending:
+                    names = ", ".join(s.name for s in pending)
+                    raise ValueError(f"Dépendances introuvables pour : {names}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                report = future.result()
+                status[stage.name] = report["status"]
+                reports.append(report)
+
+    LAST_REPORT = reports
+    print_report(reports)
+    return reports
+
+
+def print_report(reports):
+    print("\n[Pipeline] Étape            Statut    Durée     Lignes")
+    for r in reports:
+        rows = "-" if r["rows"] is None else r["rows"]
+        print(f"[Pipeline] {r['stage']:<16} {r['status']:<9} {r['seconds']:>7.2f}s  {rows}")
+        if r["error"]:
+            print(f"[Pipeline]   ↳ {r['error']}")
+
+
+if __name__ == "__main__":
+    run_pipeline(force="--force" in sys.argv)
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+# Classements et percentiles sur n'importe quelle colonne numérique, servis à
+# partir d'ordres (argsort) calculés une seule fois par version du jeu de
+# données : une requête de leaderboard n'est plus qu'une tranche d'indices.
+
+# Colonnes calculées à la volée, classables comme les autres
+VIRTUAL_COLUMNS = {
+    "Salary_Gap": lambda df: df["Salary_th"] - df["Salary"],
+}
+
+# Colonnes renvoyées avec chaque ligne de leaderboard
+LEADERBOARD_FIELDS = [
+    "Player",
+    "Team",
+    "Performance_Score",
+    "Salary",
+    "Salary_th",
+    "Indicateur",
+]
+
+
+def sortable_columns(snapshot):
+    def build(df):
+        numeric = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        virtual = [
+            name
+            for name, func in VIRTUAL_COLUMNS.items()
+            if name not in df.columns and _has_inputs(df, func)
+        ]
+        return numeric + virtual
+
+    return snapshot.derived("sortable_columns", build)
+
+
+def _has_inputs(df, func):
+    try:
+        func(df.head(0))
+    except KeyError:
+        return False
+    return True
+
+
+def column_values(snapshot, column):
+    def build(df):
+        if column in df.columns:
+            values = df[column]
+        else:
+            values = VIRTUAL_COLUMNS[column](df)
+        return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+
+    return snapshot.derived(("values", column), build)
+
+
+def ordering(snapshot, column, descending=True):
+    """Indices des lignes triées (tri stable, valeurs manquantes en dernier)."""
+
+    def build(df):
+        values = column_values(snapshot, column)
+        # -values garde l'ordre d'origine entre ex æquo, comme sort_values
+        return np.argsort(-values if descending else values, kind="stable")
+
+    return snapshot.derived(("order", column, descending), build)
+
+
+def sorted_values(snapshot, column):
+    # Valeurs croissantes sans les manquantes, pour les percentiles
+    def build(df):
+        values = column_values(snapshot, column)
+        return np.sort(values[~np.isnan(values)])
+
+    return snapshot.derived(("sorted", column), build)
+
+
+def leaderboard(snapshot, column, descending=True, limit=20, offset=0):
+    df = snapshot.df
+    rows = ordering(snapshot, column, descending)[offset : offset + limit]
+    fields = [df.columns.get_loc(c) for c in LEADERBOARD_FIELDS if c in df.columns]
+    page = df.iloc[rows, fields]
+    values = column_values(snapshot, column)[rows]
+
+    records = page.astype(object).where(page.notna(), None).to_dict("records")
+    for position, (record, value) in enumerate(zip(records, values), offset + 1):
+        record["Position"] = position
+        record[column] = None if np.isnan(value) else value.item()
+    return records
+
+
+def percentile(snapshot, pos, column):
+    """Valeur, rang (1 = meilleur, ex æquo au même rang) et percentile d'un joueur."""
+    value = column_values(snapshot, column)[pos]
+    if np.isnan(value):
+        return {"value": None, "rank": None, "percentile": None}
+    ranked = sorted_values(snapshot, column)
+    at_or_below = np.searchsorted(ranked, value, side="right")
+    return {
+        "value": value.item(),
+        "rank": int(len(ranked) - at_or_below + 1),
+        "percentile": round(100.0 * at_or_below / len(ranked), 1),
+    }
+
+
+## Comparaison de joueurs
+
+COMPARE_COLUMNS = [
+    "Points",
+    "Assists",
+    "Total_Rebounds",
+    "Steals",
+    "Blocks",
+    "TS_Percentage",
+    "Plus_Minus",
+    "Minutes",
+    "Offensive_Impact",
+    "Defensive_Impact",
+    "Performance_Score",
+    "Salary",
+    "Salary_th",
+    "Salary_Gap",
+]
+
+
+def compare(snapshot, positions, columns):
+    """Valeurs, rangs et écarts au premier joueur, colonne par colonne (vectorisé)."""
+    positions = np.asarray(positions)
+    result = {"values": {}, "deltas": {}, "ranks": {}, "rank_deltas": {}}
+    for column in columns:
+        values = column_values(snapshot, column)[positions]
+        ranked = sorted_values(snapshot, column)
+        ranks = len(ranked) - np.searchsorted(ranked, values, side="right") + 1
+        missing = np.isnan(values)
+
+        result["values"][column] = _nullable(values, missing)
+        result["deltas"][column] = _nullable(values - values[0], missing | missing[0])
+        result["ranks"][column] = _nullable(ranks, missing, int)
+        result["rank_deltas"][column] = _nullable(
+            ranks - ranks[0], missing | missing[0], int
+        )
+    return result
+
+
+def _nullable(values, missing, cast=float):
+    return [None if m else cast(v) for v, m in zip(values.tolist(), missing)]
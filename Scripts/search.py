@@ -0,0 +1,79 @@
+import numpy as np
+
+from Scripts.merge_data import clean_name
+
+# Recherche de joueurs tolérante aux fautes. Les noms sont normalisés comme au
+# matching des salaires (clean_name : sans accents, ponctuation ni suffixes),
+# découpés en trigrammes par mot ("  do", " do", "don", ...) et indexés une
+# fois par version du jeu de données : trigramme -> noms qui le contiennent.
+# Score d'un nom = part des trigrammes de la requête qu'il contient, plus un
+# bonus si la requête est un début de nom ou de mot.
+
+MIN_SCORE = 0.4
+PREFIX_BOOST = 0.3  # Le nom commence par la requête
+WORD_PREFIX_BOOST = 0.2  # Chaque mot de la requête commence un mot du nom
+RERANK_SIZE = 50  # Candidats re-classés avec les bonus
+
+
+def trigrams(text):
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    def __init__(self, names):
+        self.names = []  # Nom affiché (première occurrence) par clé
+        self.keys = []  # Nom normalisé
+        seen = {}
+        postings = {}
+        for name in names:
+            if not isinstance(name, str):
+                continue
+            key = clean_name(name)
+            if not key or key in seen:
+                continue
+            seen[key] = len(self.keys)
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(seen[key])
+            self.keys.append(key)
+            self.names.append(name)
+        self.postings = {
+            g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()
+        }
+        self.lengths = np.array([len(k) for k in self.keys], dtype=np.int32)
+
+    def search(self, query, limit=10):
+        key = clean_name(query)
+        grams = trigrams(key)
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        if not lists:
+            return []
+
+        # Nombre de trigrammes partagés par nom (comptage, sans tri)
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.keys))
+        ids = np.flatnonzero(shared >= MIN_SCORE * len(grams))
+        scores = shared[ids] / len(grams)
+        if len(ids) > RERANK_SIZE:
+            # Ex aequo départagés par la longueur, comme au classement final :
+            # sinon le nom exact peut sortir des candidats
+            top = np.lexsort((self.lengths[ids], -scores))[:RERANK_SIZE]
+            ids, scores = ids[top], scores[top]
+
+        words = key.split()
+        ranked = []
+        for i, score in zip(ids.tolist(), scores.tolist()):
+            candidate = self.keys[i]
+            if candidate.startswith(key):
+                score += PREFIX_BOOST
+            elif all(any(w.startswith(q) for w in candidate.split()) for q in words):
+                score += WORD_PREFIX_BOOST
+            ranked.append((-score, len(candidate), i))
+        ranked.sort()
+        return [self.names[i] for _, _, i in ranked[:limit]]
+
+
+def search_index(snapshot):
+    return snapshot.derived("search_index", lambda df: SearchIndex(df["Player"]))
@@ -0,0 +1,117 @@
+import os
+import shutil
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+from Scripts import storage
+
+# Mode de service multi-processus (NBA_SERVING=shared). Chaque version publiée
+# est un fichier Arrow immuable, data/serving/nba_data-<version>.arrow ; le
+# fichier CURRENT (pointeur) donne celle à servir. Les workers mappent le
+# fichier en mémoire et construisent un DataFrame sans copie : colonnes
+# numériques en vues sur le mapping, chaînes en string[pyarrow]. Les pages
+# sont partagées par le cache du système entre tous les workers.
+# Publier = écrire le fichier puis remplacer le pointeur (os.replace, atomique) ;
+# le pointeur contient la version, les workers le surveillent (stat).
+
+SERVING_DIR = os.path.join(storage.DATA_DIR, "serving")
+POINTER_NAME = "CURRENT"
+REFRESH_MARKER = "REFRESH_REQUESTED"  # Demande de rafraîchissement d'un worker
+KEEP_VERSIONS = 3  # Versions gardées pour les workers encore sur l'ancienne
+
+_pointer = {"stat": None, "value": None}
+_pointer_lock = threading.Lock()
+
+
+def pointer_path():
+    return os.path.join(SERVING_DIR, POINTER_NAME)
+
+
+def published_path(version, name="nba_data"):
+    return os.path.join(SERVING_DIR, f"{name}-{version}.arrow")
+
+
+def publish(name="nba_data"):
+    """Publie la version courante du jeu de données ; renvoie cette version."""
+    version = storage.dataset_version(name)
+    if version is None:
+        return None
+    os.makedirs(SERVING_DIR, exist_ok=True)
+    target = published_path(version, name)
+
+    if not os.path.exists(target):
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        try:
+            os.link(storage.dataset_path(name), tmp_path)  # Même inode, sans copie
+        except OSError:
+            shutil.copyfile(storage.dataset_path(name), tmp_path)
+        os.replace(tmp_path, target)
+
+    if read_pointer() != version:
+        tmp_pointer = f"{pointer_path()}.{os.getpid()}.tmp"
+        with open(tmp_pointer, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_pointer, pointer_path())
+        _prune(name, os.path.basename(target))
+    return version
+
+
+def _prune(name, current):
+    files = [
+        f
+        for f in os.listdir(SERVING_DIR)
+        if f.startswith(f"{name}-") and f.endswith(".arrow") and f != current
+    ]
+    files.sort(key=lambda f: os.path.getmtime(os.path.join(SERVING_DIR, f)))
+    for f in files[: max(len(files) - (KEEP_VERSIONS - 1), 0)]:
+        try:
+            # Un worker qui mappe encore ce fichier garde ses données (POSIX)
+            os.remove(os.path.join(SERVING_DIR, f))
+        except OSError:
+            pass
+
+
+def read_pointer():
+    """Version publiée ; le fichier n'est relu que si le pointeur a changé."""
+    try:
+        st = os.stat(pointer_path())
+    except FileNotFoundError:
+        return None
+    key = (st.st_ino, st.st_mtime_ns)
+    with _pointer_lock:
+        if _pointer["stat"] != key:
+            with open(pointer_path(), encoding="utf-8") as f:
+                _pointer["value"] = f.read().strip()
+            _pointer["stat"] = key
+        return _pointer["value"]
+
+
+def request_refresh():
+    os.makedirs(SERVING_DIR, exist_ok=True)
+    with open(os.path.join(SERVING_DIR, REFRESH_MARKER), "w", encoding="utf-8"):
+        pass
+
+
+def take_refresh_request():
+    """True (une seule fois) si un worker a demandé un rafraîchissement."""
+    try:
+        os.remove(os.path.join(SERVING_DIR, REFRESH_MARKER))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _string_types(arrow_type):
+    if arrow_type in (pa.string(), pa.large_string()):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def attach(version, name="nba_data"):
+    """DataFrame adossé au fichier publié (mmap, sans copie des colonnes)."""
+    with pa.memory_map(published_path(version, name), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    # split_blocks : une colonne = un bloc, pas de consolidation (donc de copie)
+    return table.to_pandas(split_blocks=True, types_mapper=_string_types)
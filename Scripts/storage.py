@@ -0,0 +1,109 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+# Stockage colonnaire (Arrow IPC) : format canonique entre les étapes du pipeline.
+# Les fichiers ne sont pas compressés pour pouvoir être mappés en mémoire (mmap)
+# et lus sans copie, colonne par colonne.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+# Onglet Excel associé à chaque jeu de données (ancien format / export optionnel)
+EXCEL_SHEETS = {
+    "NBA_Stat": "Stats",
+    "NBA_Salary": "Salary",
+    "nba_data": "Analyse_NBA",
+}
+
+
+def dataset_path(name, ext="arrow"):
+    return os.path.join(DATA_DIR, f"{name}.{ext}")
+
+
+def dataset_mtime(name):
+    """Date de modification du jeu de données (Arrow, sinon ancien Excel)."""
+    for ext in ("arrow", "xlsx"):
+        path = dataset_path(name, ext)
+        if os.path.exists(path):
+            return os.path.getmtime(path)
+    return None
+
+
+def dataset_version(name):
+    """Identifiant de version du fichier Arrow (change à chaque écriture)."""
+    path = dataset_path(name)
+    if not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def save_dataset(df, name):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = dataset_path(name)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Écriture atomique : fichier temporaire puis renommage, un lecteur ne voit
+    # jamais un fichier à moitié écrit
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def _read_excel_dataset(name):
+    xlsx_path = dataset_path(name, "xlsx")
+    if not os.path.exists(xlsx_path):
+        return None
+    df = pd.read_excel(xlsx_path, sheet_name=EXCEL_SHEETS.get(name, 0))
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def load_dataset(name, columns=None):
+    path = dataset_path(name)
+
+    # Migration unique : si seul l'ancien Excel existe, on le convertit en Arrow
+    if not os.path.exists(path):
+        df = _read_excel_dataset(name)
+        if df is None:
+            return pd.DataFrame()
+        save_dataset(df, name)
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return df
+
+    # Lecture mmap : seules les colonnes demandées sont matérialisées
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table.to_pandas()
+
+
+def export_excel(df, name, path=None, styled=False):
+    """Export Excel optionnel (hors du chemin critique)."""
+    from Scripts.excel_export import write_excel
+
+    path = path or dataset_path(name, "xlsx")
+    return write_excel(df, path, EXCEL_SHEETS.get(name, "Sheet1"), styled=styled)
+
+
+def dataset_rows(name):
+    """Nombre de lignes, lu dans les métadonnées Arrow sans charger les données."""
+    path = dataset_path(name)
+    if not os.path.exists(path):
+        return None
+    with pa.memory_map(path, "r") as source:
+        reader = pa.ipc.open_file(source)
+        return sum(
+            reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+        )
@@ -0,0 +1,160 @@
+import base64
+
+import numpy as np
+
+from Scripts import rankings
+
+# Requêtes filtrées sur la ligue entière (/api/table). Index construits une
+# fois par version du jeu de données :
+# - colonnes catégorielles : valeur -> positions des lignes (triées)
+# - colonnes numériques : ordre croissant + valeurs triées (rankings.py)
+# Un filtre ne coûte donc que la taille de son résultat, pas celle de la ligue.
+
+CATEGORICAL_FILTERS = {
+    "team": "Team",
+    "indicateur": "Indicateur",
+    "contract_type": "Contract_Type",
+}
+
+TABLE_COLUMNS = [
+    "Player",
+    "Team",
+    "Contract_Type",
+    "Points",
+    "Assists",
+    "Total_Rebounds",
+    "Performance_Score",
+    "Salary",
+    "Salary_th",
+    "Indicateur",
+]
+
+
+class QueryError(ValueError):
+    pass
+
+
+def category_index(snapshot, column):
+    # Valeur -> positions triées ; on accepte aussi la valeur sans son emoji
+    # et sans tenir compte de la casse ("overpaid" pour "🔴 Overpaid")
+    def build(df):
+        codes, uniques = df[column].factorize()
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        index = {}
+        for i, value in enumerate(uniques):
+            rows = order[bounds[i] : bounds[i + 1]]
+            label = str(value).lower()
+            for key in (value, label, label.split(" ", 1)[-1]):
+                index.setdefault(key, rows)
+        return index
+
+    return snapshot.derived(("category", column), build)
+
+
+def category_rows(snapshot, column, values):
+    index = category_index(snapshot, column)
+    parts = [index.get(v, index.get(v.strip().lower())) for v in values]
+    parts = [p for p in parts if p is not None]
+    if not parts:
+        return np.array([], dtype=np.intp)
+    return np.unique(np.concatenate(parts))
+
+
+def all_rows(snapshot):
+    return snapshot.derived("all_rows", lambda df: np.arange(len(df)))
+
+
+def range_rows(snapshot, column, low=None, high=None):
+    """Positions (triées) des lignes avec low <= valeur <= high."""
+    ranked = rankings.sorted_values(snapshot, column)
+    order = rankings.ordering(snapshot, column, descending=False)
+    start = np.searchsorted(ranked, low, side="left") if low is not None else 0
+    stop = len(ranked) if high is None else np.searchsorted(ranked, high, side="right")
+    return np.sort(order[start:stop])
+
+
+def _float(value, name):
+    try:
+        return float(value)
+    except ValueError:
+        raise QueryError(f"Invalid number for {name}: {value}") from None
+
+
+def filter_rows(snapshot, args):
+    """Positions des lignes qui passent tous les filtres de la requête."""
+    df = snapshot.df
+    candidates = []
+
+    for param, column in CATEGORICAL_FILTERS.items():
+        if args.get(param) and column in df.columns:
+            candidates.append(category_rows(snapshot, column, args[param].split(",")))
+
+    # Bornes numériques : min_<colonne> / max_<colonne>
+    sortable = rankings.sortable_columns(snapshot)
+    bounds = {}
+    for key, value in args.items():
+        prefix, _, column = key.partition("_")
+        if prefix in ("min", "max") and column:
+            if column not in sortable:
+                raise QueryError(f"Unknown column: {column}")
+            bounds.setdefault(column, {})[prefix] = _float(value, key)
+    for column, b in bounds.items():
+        candidates.append(range_rows(snapshot, column, b.get("min"), b.get("max")))
+
+    if not candidates:
+        return all_rows(snapshot)
+    # Intersection en partant du plus petit ensemble
+    candidates.sort(key=len)
+    rows = candidates[0]
+    for other in candidates[1:]:
+        rows = np.intersect1d(rows, other, assume_unique=True)
+    return rows
+
+
+## Pagination par curseur (liée à la version : les positions en dépendent)
+
+
+def encode_cursor(version, pos):
+    raw = f"{version}:{pos}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor, version):
+    try:
+        raw = base64.urlsafe_b64decode(cursor).decode("utf-8")
+        cursor_version, pos = raw.rsplit(":", 1)
+        pos = int(pos)
+    except ValueError:
+        raise QueryError("Invalid cursor") from None
+    if cursor_version != str(version):
+        raise QueryError("Cursor expired: the dataset has been refreshed")
+    return pos
+
+
+def query_table(snapshot, args, columns=None, limit=50, cursor=None):
+    df = snapshot.df
+    if columns:
+        unknown = [c for c in columns if c not in df.columns]
+        if unknown:
+            raise QueryError(f"Unknown column: {', '.join(unknown)}")
+    else:
+        columns = [c for c in TABLE_COLUMNS if c in df.columns]
+    rows = filter_rows(snapshot, args)
+    total = len(rows)
+
+    if cursor:
+        after = decode_cursor(cursor, snapshot.version)
+        rows = rows[np.searchsorted(rows, after, side="right") :]
+    page_rows = rows[:limit]
+    page = df.iloc[page_rows, [df.columns.get_loc(c) for c in columns]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(snapshot.version, int(page_rows[-1]))
+    return {
+        "total": total,
+        "columns": columns,
+        "rows": page.astype(object).where(page.notna(), None).to_dict("records"),
+        "next_cursor": next_cursor,
+    }
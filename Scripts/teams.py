@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+# Agrégats par équipe (masse salariale, valeur projetée, surplus, nombre de
+# joueurs sous/sur-payés, meilleurs contributeurs), calculés une fois par
+# version du jeu de données : un rafraîchissement crée un nouveau snapshot,
+# donc de nouveaux agrégats. Masse salariale et valeur projetée ne portent que
+# sur les joueurs au salaire connu, pour que le surplus compare des choses
+# comparables.
+
+TOP_CONTRIBUTORS = 5
+INDICATOR_COUNTS = {
+    "Underpaid": "Underpaid",
+    "Overpaid": "Overpaid",
+    "Well paid": "Well_Paid",
+    "Unknown": "Unknown_Salary",
+}
+AMOUNT_FIELDS = {"Payroll", "Projected_Value", "Surplus", "Total_Performance"}
+CONTRIBUTOR_FIELDS = [
+    "Player",
+    "Performance_Score",
+    "Salary",
+    "Salary_th",
+    "Indicateur",
+]
+
+
+def _numeric(df, column):
+    return pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+
+def _build(df):
+    if df.empty or "Team" not in df.columns:
+        return {"teams": [], "by_code": {}, "members": {}}
+    codes, teams = pd.factorize(df["Team"])  # Équipe manquante : code -1
+    valid = codes >= 0
+    codes_v = codes[valid]
+    n = len(teams)
+
+    def total(values):
+        return np.bincount(codes_v, weights=values[valid], minlength=n)
+
+    salary = _numeric(df, "Salary")
+    salary_th = _numeric(df, "Salary_th")
+    performance = _numeric(df, "Performance_Score")
+    known = (salary > 0).astype(float)
+
+    payroll = total(salary)
+    projected = total(salary_th * known)
+    sums = {
+        "Players": np.bincount(codes_v, minlength=n),
+        "Payroll": payroll,
+        "Projected_Value": projected,
+        "Surplus": projected - payroll,
+        "Total_Performance": total(performance),
+    }
+    labels = df["Indicateur"].astype(str) if "Indicateur" in df.columns else None
+    for label, field in INDICATOR_COUNTS.items():
+        if labels is None:
+            sums[field] = np.zeros(n)
+        else:
+            hits = labels.str.contains(label, regex=False).to_numpy(dtype=float)
+            sums[field] = total(hits)
+
+    # Membres de chaque équipe, triés par Performance_Score décroissante
+    order = np.lexsort((-performance, codes))
+    order = order[codes[order] >= 0]
+    bounds = np.searchsorted(codes[order], np.arange(n + 1))
+
+    rows, by_code, members = [], {}, {}
+    for i, team in enumerate(teams):
+        row = {"Team": team}
+        for field, values in sums.items():
+            value = values[i].item()
+            row[field] = value if field in AMOUNT_FIELDS else int(value)
+        rows.append(row)
+        by_code[str(team).upper()] = i
+        members[i] = order[bounds[i] : bounds[i + 1]]
+    return {"teams": rows, "by_code": by_code, "members": members}
+
+
+def team_aggregates(snapshot):
+    return snapshot.derived("team_aggregates", _build)
+
+
+def list_teams(snapshot, sort="Surplus", descending=True):
+    teams = team_aggregates(snapshot)["teams"]
+    if teams and sort not in teams[0]:
+        raise KeyError(sort)
+    return sorted(teams, key=lambda row: row[sort], reverse=descending)
+
+
+def team_detail(snapshot, code, top=TOP_CONTRIBUTORS):
+    """Agrégats d'une équipe et ses meilleurs contributeurs (None si inconnue)."""
+    aggregates = team_aggregates(snapshot)
+    i = aggregates["by_code"].get(str(code).strip().upper())
+    if i is None:
+        return None
+    df = snapshot.df
+    members = aggregates["members"][i][:top]
+    fields = [df.columns.get_loc(c) for c in CONTRIBUTOR_FIELDS if c in df.columns]
+    page = df.iloc[members, fields]
+    contributors = page.astype(object).where(page.notna(), None).to_dict("records")
+    for pos, record in zip(members.tolist(), contributors):
+        record["id"] = pos
+    return {**aggregates["teams"][i], "Top_Contributors": contributors}
@@ -0,0 +1,276 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+from cachetools import TTLCache
+
+from Scripts.utils_nba import (
+    MAX_SALARY_FLOOR,
+    MIN_SALARY,
+    MINUTES_THRESHOLD,
+    OVERPAID_RATIO,
+    UNDERPAID_RATIO,
+    WEIGHTS,
+    prepare_stats,
+)
+
+# Bandes d'incertitude sur Salary_th (Monte Carlo). Les moyennes par match
+# d'un joueur avec peu de matchs sont bruitées : on tire des moyennes
+# plausibles (loi normale, écart-type de la moyenne = écart-type par match /
+# racine du nombre de matchs), puis on rejoue le scoring de compute_metrics
+# (maxima de la ligue compris) sur chaque tirage, vectorisé joueurs x tirages.
+#
+# Écart-type par match : sqrt(dispersion * moyenne) pour les stats de comptage
+# (Poisson surdispersée ; un panier vaut 2 ou 3 points), constant pour le +/-.
+# Le TS% suit les points tirés (tentatives inchangées) ; minutes et % de
+# victoires restent fixes.
+
+DEFAULT_DRAWS = 10000
+DRAW_PRESETS = (1000, 5000, DEFAULT_DRAWS)  # Seules valeurs servies par l'API
+PERCENTILES = [5, 25, 50, 75, 95]
+CHUNK_CELLS = 2_000_000  # joueurs x tirages traités à la fois (mémoire bornée)
+
+COUNT_DISPERSION = {
+    "Points": 2.5,
+    "Assists": 1.0,
+    "Total_Rebounds": 1.0,
+    "Steals": 1.0,
+    "Blocks": 1.0,
+}
+PLUS_MINUS_GAME_SD = 11.0
+
+LABELS = ["Underpaid", "Well_paid", "Overpaid"]  # Indicateur sans emoji
+
+# Résultats par (version, nombre de tirages) : cache borné, comme les scénarios
+CACHE_SIZE = 16
+CACHE_TTL = 600  # secondes
+
+_cache = TTLCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+_cache_lock = threading.Lock()
+_pending = {}  # Clé -> verrou du calcul en cours
+
+
+def _inputs(df):
+    # Moyennes et écarts-types des moyennes, en tableaux NumPy (picklables)
+    df = prepare_stats(df)
+    games = np.maximum(
+        pd.to_numeric(df.get("Games_Played", 1), errors="coerce").fillna(1), 1
+    ).to_numpy(dtype=float)
+
+    means, sds = {}, {}
+    for stat, dispersion in COUNT_DISPERSION.items():
+        means[stat] = df[stat].to_numpy(dtype=float)
+        sds[stat] = np.sqrt(np.maximum(means[stat], 0) * dispersion / games)
+    means["Plus_Minus"] = df["Plus_Minus"].to_numpy(dtype=float)
+    sds["Plus_Minus"] = PLUS_MINUS_GAME_SD / np.sqrt(games)
+
+    minutes = df["Minutes"].to_numpy(dtype=float)
+    salary = df["Salary"].to_numpy(dtype=float)
+    return {
+        "means": means,
+        "sds": sds,
+        "ts": df["TS_Percentage"].to_numpy(dtype=float),
+        "win": df["Win_Pct"].to_numpy(dtype=float),
+        "minutes_factor": np.where(
+            minutes >= MINUTES_THRESHOLD, 1.0, (minutes / MINUTES_THRESHOLD) ** 2
+        ),
+        "salary": salary,
+        "target_max": max(salary.max(), MAX_SALARY_FLOOR),
+    }
+
+
+def _positive(top):
+    return np.where(top > 0, top, 1.0)
+
+
+def _player_slice(inputs, start, stop):
+    def part(values):
+        return values[start:stop]
+
+    return {
+        "means": {stat: part(v) for stat, v in inputs["means"].items()},
+        "sds": {stat: part(v) for stat, v in inputs["sds"].items()},
+        "ts": part(inputs["ts"]),
+        "win": part(inputs["win"]),
+        "minutes_factor": part(inputs["minutes_factor"]),
+        "salary": part(inputs["salary"]),
+        "target_max": inputs["target_max"],
+    }
+
+
+def _draw_stats(inputs, draws, seed):
+    """Moyennes tirées (tirages x joueurs) ; mêmes valeurs à chaque appel."""
+    rng = np.random.default_rng(seed)
+    means, sds = inputs["means"], inputs["sds"]
+    n = len(inputs["salary"])
+
+    def draw(stat):
+        # Calcul en place : pas de tableau intermédiaire tirages x joueurs
+        values = rng.standard_normal((draws, n))
+        values *= sds[stat]
+        values += means[stat]
+        return values
+
+    stats = {}
+    for stat in COUNT_DISPERSION:
+        values = draw(stat)
+        stats[stat] = np.maximum(values, 0, out=values)
+    stats["Plus_Minus"] = draw("Plus_Minus")
+    return stats
+
+
+def _performance(inputs, stats, maxima):
+    # Scoring de compute_metrics, avec les maxima de la ligue de chaque tirage
+    def perf(stat):
+        return stats[stat] / _positive(maxima[stat])[:, None]
+
+    perf_plus_minus = stats["Plus_Minus"] / (maxima["Plus_Minus"][:, None] + 1)
+
+    # TS% à tentatives constantes : proportionnel aux points
+    points = inputs["means"]["Points"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ts_scale = np.where(points > 0, inputs["ts"] / points, 0)
+    ts = np.clip(stats["Points"] * ts_scale, 0, 1.0)
+
+    w = WEIGHTS
+    score = (
+        perf("Points") * w["Points"]
+        + ts * w["TS_Perc"]
+        + perf_plus_minus * w["PlusMinus"]
+        + perf("Assists") * w["Assists"]
+        + ((perf("Steals") + perf("Blocks")) / 2) * w["Defense"]
+        + perf("Total_Rebounds") * w["Rebounds"]
+        + inputs["win"] * w["Win"]
+    ) / sum(w.values())
+    return np.maximum(0, score * inputs["minutes_factor"])
+
+
+# Les maxima de la ligue dépendent de tous les joueurs : trois passes sur les
+# paquets de joueurs, chacune régénérant les tirages du paquet depuis sa graine
+# (maxima des stats, puis maximum de la performance, puis bandes).
+
+
+def _chunk_maxima(inputs, draws, seed):
+    stats = _draw_stats(inputs, draws, seed)
+    maxima = {stat: stats[stat].max(axis=1) for stat in COUNT_DISPERSION}
+    maxima["Plus_Minus"] = np.abs(stats["Plus_Minus"]).max(axis=1)
+    return maxima
+
+
+def _chunk_max_performance(inputs, draws, seed, maxima):
+    stats = _draw_stats(inputs, draws, seed)
+    return _performance(inputs, stats, maxima).max(axis=1)
+
+
+def _chunk_bands(inputs, draws, seed, maxima, max_p):
+    """Percentiles de Salary_th et compte des étiquettes des joueurs du paquet."""
+    performance = _performance(inputs, _draw_stats(inputs, draws, seed), maxima)
+    max_p = max_p[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        salary_th = np.where(
+            max_p > 0, np.floor(performance / max_p * inputs["target_max"]), MIN_SALARY
+        )
+    salary_th = np.maximum(salary_th, MIN_SALARY)
+
+    ratio = salary_th / (inputs["salary"] + 1)
+    counts = {
+        "Underpaid": (ratio > UNDERPAID_RATIO).sum(axis=0),
+        "Overpaid": (ratio < OVERPAID_RATIO).sum(axis=0),
+    }
+    return np.percentile(salary_th, PERCENTILES, axis=0), counts
+
+
+def _chunks(n_players, draws):
+    # Paquets de joueurs avec tous leurs tirages : au plus CHUNK_CELLS cellules
+    size = max(1, CHUNK_CELLS // max(draws, 1))
+    starts = range(0, n_players, size)
+    return [(start, min(start + size, n_players)) for start in starts]
+
+
+def _merge_maxima(a, b):
+    return {stat: np.maximum(a[stat], b[stat]) for stat in a}
+
+
+def simulate(df, draws=DEFAULT_DRAWS, seed=0, workers=0):
+    """Percentiles de Salary_th et probabilité de chaque Indicateur, par joueur.
+
+    La mémoire ne dépend que de CHUNK_CELLS et du nombre de tirages (maxima
+    par tirage), pas du produit joueurs x tirages. workers > 1 répartit les
+    paquets sur un pool de processus ; le résultat ne dépend que de la graine.
+    """
+    inputs = _inputs(df)
+    parts = [_player_slice(inputs, a, b) for a, b in _chunks(len(df), draws)]
+    seeds = np.random.SeedSequence(seed).spawn(len(parts))
+    executor = None
+    if workers and workers > 1 and len(parts) > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    run = executor.map if executor else map
+
+    try:
+        maxima = reduce(_merge_maxima, run(_chunk_maxima, parts, repeat(draws), seeds))
+        max_p = reduce(
+            np.maximum,
+            run(_chunk_max_performance, parts, repeat(draws), seeds, repeat(maxima)),
+        )
+        chunks = list(
+            run(
+                _chunk_bands,
+                parts,
+                repeat(draws),
+                seeds,
+                repeat(maxima),
+                repeat(max_p),
+            )
+        )
+    finally:
+        if executor:
+            executor.shutdown()
+
+    bands = np.concatenate([c[0] for c in chunks], axis=1)
+    counts = {
+        label: np.concatenate([c[1][label] for c in chunks])
+        for label in ("Underpaid", "Overpaid")
+    }
+
+    result = pd.DataFrame({"Player": df["Player"].to_numpy()})
+    for q, band in zip(PERCENTILES, bands):
+        result[f"Salary_th_P{q:02d}"] = np.floor(band)
+    unknown = inputs["salary"] <= 0
+    probabilities = {
+        "Underpaid": counts["Underpaid"] / draws,
+        "Overpaid": counts["Overpaid"] / draws,
+    }
+    probabilities["Well_paid"] = (
+        1 - probabilities["Underpaid"] - probabilities["Overpaid"]
+    )
+    for label in LABELS:
+        result[f"P_{label}"] = np.where(unknown, np.nan, probabilities[label])
+    return result
+
+
+def snapshot_bands(snapshot, draws=DEFAULT_DRAWS, workers=0):
+    """simulate() sur une version du jeu de données, mis en cache hors du snapshot.
+
+    Un seul calcul par clé : les requêtes identiques simultanées attendent son
+    résultat, sans bloquer les structures dérivées du snapshot.
+    """
+    key = (snapshot.version, draws)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+        lock = _pending.setdefault(key, threading.Lock())
+
+    with lock:
+        with _cache_lock:
+            cached = _cache.get(key)
+        if cached is None:
+            cached = simulate(snapshot.df, draws, workers=workers)
+            with _cache_lock:
+                _cache[key] = cached
+                if _pending.get(key) is lock:
+                    del _pending[key]
+    return cached
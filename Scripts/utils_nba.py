@@ -1,30 +1,74 @@
 import numpy as np
 import pandas as pd
 
+# Paramètres du modèle (pondérations et seuils utilisés par compute_metrics)
+WEIGHTS = {
+    "Points": 15.0,
+    "TS_Perc": 10.0,
+    "PlusMinus": 8.0,
+    "Assists": 6.0,
+    "Defense": 5.0,
+    "Rebounds": 4.0,
+    "Win": 2.0,
+}
+OFFENSIVE_MIX = {"Points": 0.6, "Assists": 0.4, "TS": 0.2}
+DEFENSIVE_MIX = {"Rebounds": 0.4, "Steals": 0.3, "Blocks": 0.3}
+MINUTES_THRESHOLD = 26
+UNDERPAID_RATIO = 1.15
+OVERPAID_RATIO = 0.85
+MIN_SALARY = 1157153
+MAX_SALARY_FLOOR = 55700000
 
-def compute_metrics(df):
+
+# On classifie le type de contrat pour expliquer certains "bas" salaires (rookies)
+def classify_contract(salary):
+    if salary < 2_000_000:
+        return "Minimum / Two-Way"
+    if salary <= 16_000_000:
+        return "Rookie Scale"
+    if salary > 35_000_000:
+        return "Max / Supermax"
+    return "Standard"
+
+
+def metrics_params():
+    return {
+        "weights": WEIGHTS,
+        "offensive_mix": OFFENSIVE_MIX,
+        "defensive_mix": DEFENSIVE_MIX,
+        "minutes_threshold": MINUTES_THRESHOLD,
+        "underpaid_ratio": UNDERPAID_RATIO,
+        "overpaid_ratio": OVERPAID_RATIO,
+        "min_salary": MIN_SALARY,
+        "max_salary_floor": MAX_SALARY_FLOOR,
+    }
+
+
+NUMERIC_COLS = [
+    "Points",
+    "Assists",
+    "Total_Rebounds",
+    "Steals",
+    "Blocks",
+    "Turnovers",
+    "Field_Goals_Made",
+    "Field_Goals_Attempted",
+    "Three_PT_Made",
+    "FG_Percentage",
+    "Three_PT_Percentage",
+    "FT_Percentage",
+    "Win_Pct",
+    "Plus_Minus",
+    "Minutes",
+    "Salary",
+]
+
+
+def prepare_stats(df):
     df = df.copy()
 
     # 1. Conversion numérique stricte
-    cols = [
-        "Points",
-        "Assists",
-        "Total_Rebounds",
-        "Steals",
-        "Blocks",
-        "Turnovers",
-        "Field_Goals_Made",
-        "Field_Goals_Attempted",
-        "Three_PT_Made",
-        "FG_Percentage",
-        "Three_PT_Percentage",
-        "FT_Percentage",
-        "Win_Pct",
-        "Plus_Minus",
-        "Minutes",
-        "Salary",
-    ]
-    for c in cols:
+    for c in NUMERIC_COLS:
         if c in df.columns:
             df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
 
@@ -36,19 +80,38 @@ def compute_metrics(df):
     denom_ts = 2 * (df["Field_Goals_Attempted"] + 0.44 * fta)
     df["TS_Percentage"] = np.where(denom_ts > 0, df["Points"] / denom_ts, 0)
     df["TS_Percentage"] = np.clip(df["TS_Percentage"], 0, 1.0)
+    return df
+
+
+def league_maxima(df):
+    max_v = df[NUMERIC_COLS].max()
+    return {
+        "Points": max_v.get("Points", 1),
+        "Assists": max_v.get("Assists", 1),
+        "Total_Rebounds": max_v.get("Total_Rebounds", 1),
+        "Steals": max_v.get("Steals", 1),
+        "Blocks": max_v.get("Blocks", 1),
+        "Plus_Minus": np.max(np.abs(df["Plus_Minus"])),
+    }
+
 
+def normalize_stats(df, maxima):
     # 3. Normalisation pour Performance Score
-    max_v = df[cols].max()
-    df["Perf_Points"] = df["Points"] / max_v.get("Points", 1)
-    df["Perf_Assists"] = df["Assists"] / max_v.get("Assists", 1)
-    df["Perf_Rebounds"] = df["Total_Rebounds"] / max_v.get("Total_Rebounds", 1)
-    df["Perf_Steals"] = df["Steals"] / max_v.get("Steals", 1)
-    df["Perf_Blocks"] = df["Blocks"] / max_v.get("Blocks", 1)
+    df["Perf_Points"] = df["Points"] / maxima["Points"]
+    df["Perf_Assists"] = df["Assists"] / maxima["Assists"]
+    df["Perf_Rebounds"] = df["Total_Rebounds"] / maxima["Total_Rebounds"]
+    df["Perf_Steals"] = df["Steals"] / maxima["Steals"]
+    df["Perf_Blocks"] = df["Blocks"] / maxima["Blocks"]
+
+    df["Perf_PlusMinus"] = df["Plus_Minus"] / (maxima["Plus_Minus"] + 1)
+    df["Minutes_Factor"] = np.where(
+        df["Minutes"] >= MINUTES_THRESHOLD,
+        1.0,
+        (df["Minutes"] / MINUTES_THRESHOLD) ** 2,
+    )
 
-    pm_abs_max = np.max(np.abs(df["Plus_Minus"]))
-    df["Perf_PlusMinus"] = df["Plus_Minus"] / (pm_abs_max + 1)
-    df["Minutes_Factor"] = np.where(df["Minutes"] >= 26, 1.0, (df["Minutes"] / 26) ** 2)
 
+def add_ranks(df):
     # 4. LEAGUE RANKING (Classement n°1, n°2...)
     df["Rank_Points"] = df["Points"].rank(ascending=False, method="min").astype(int)
     df["Rank_Assists"] = df["Assists"].rank(ascending=False, method="min").astype(int)
@@ -60,28 +123,21 @@ def compute_metrics(df):
         (df["Steals"] + df["Blocks"]).rank(ascending=False, method="min").astype(int)
     )
 
-    # 5. RECALCUL DES IMPACTS (Échelle 0-100 dynamique)
-    # On normalise par rapport au maximum de la ligue pour éviter les zéros
+
+def raw_scores(df):
+    # Scores bruts par joueur, avant normalisation par les maxima de la ligue
     off_raw = (
-        df["Perf_Points"] * 0.6 + df["Perf_Assists"] * 0.4 + df["TS_Percentage"] * 0.2
+        df["Perf_Points"] * OFFENSIVE_MIX["Points"]
+        + df["Perf_Assists"] * OFFENSIVE_MIX["Assists"]
+        + df["TS_Percentage"] * OFFENSIVE_MIX["TS"]
     )
-    df["Offensive_Impact"] = np.floor((off_raw / off_raw.max()) * 100)
-
     def_raw = (
-        df["Perf_Rebounds"] * 0.4 + df["Perf_Steals"] * 0.3 + df["Perf_Blocks"] * 0.3
+        df["Perf_Rebounds"] * DEFENSIVE_MIX["Rebounds"]
+        + df["Perf_Steals"] * DEFENSIVE_MIX["Steals"]
+        + df["Perf_Blocks"] * DEFENSIVE_MIX["Blocks"]
     )
-    df["Defensive_Impact"] = np.floor((def_raw / def_raw.max()) * 100)
 
-    # 6. SCORE DE PERFORMANCE & SALAIRE (Inchangé)
-    w = {
-        "Points": 15.0,
-        "TS_Perc": 10.0,
-        "PlusMinus": 8.0,
-        "Assists": 6.0,
-        "Defense": 5.0,
-        "Rebounds": 4.0,
-        "Win": 2.0,
-    }
+    w = WEIGHTS
     total_w = sum(w.values())
     prod_score = (
         df["Perf_Points"] * w["Points"]
@@ -92,25 +148,50 @@ def compute_metrics(df):
         + df["Perf_Rebounds"] * w["Rebounds"]
         + df["Win_Pct"] * w["Win"]
     ) / total_w
+    performance = np.maximum(0, prod_score * df["Minutes_Factor"])
+    return off_raw, def_raw, performance
 
-    df["Performance_Score"] = np.maximum(0, prod_score * df["Minutes_Factor"])
-    max_p = df["Performance_Score"].max()
-    target_max = max(df["Salary"].max(), 55700000)
+
+def finalize_scores(df, off_raw, def_raw, performance, off_max, def_max, max_p, target_max):
+    # 5. RECALCUL DES IMPACTS (Échelle 0-100 dynamique)
+    # On normalise par rapport au maximum de la ligue pour éviter les zéros
+    df["Offensive_Impact"] = np.floor((off_raw / off_max) * 100)
+    df["Defensive_Impact"] = np.floor((def_raw / def_max) * 100)
+
+    # 6. SCORE DE PERFORMANCE & SALAIRE (Inchangé)
+    df["Performance_Score"] = performance
 
     if max_p > 0:
         df["Salary_th"] = np.floor((df["Performance_Score"] / max_p) * target_max)
     else:
-        df["Salary_th"] = 1157153
+        df["Salary_th"] = MIN_SALARY
 
-    df.loc[df["Salary_th"] < 1157153, "Salary_th"] = 1157153
+    df.loc[df["Salary_th"] < MIN_SALARY, "Salary_th"] = MIN_SALARY
 
     # 7. Formattage Final
     df["Salary_th_Format"] = [f"${int(x):,}" for x in df["Salary_th"]]
     df["Salary_Format"] = [f"${int(x):,}" for x in df["Salary"]]
     df["Indicateur"] = "🟡 Well paid"
     ratio = df["Salary_th"] / (df["Salary"] + 1)
-    df.loc[ratio > 1.15, "Indicateur"] = "🟢 Underpaid"
-    df.loc[ratio < 0.85, "Indicateur"] = "🔴 Overpaid"
+    df.loc[ratio > UNDERPAID_RATIO, "Indicateur"] = "🟢 Underpaid"
+    df.loc[ratio < OVERPAID_RATIO, "Indicateur"] = "🔴 Overpaid"
     df.loc[df["Salary"] <= 0, "Indicateur"] = "Unknown"
 
+
+def compute_metrics(df):
+    df = prepare_stats(df)
+    normalize_stats(df, league_maxima(df))
+    add_ranks(df)
+
+    off_raw, def_raw, performance = raw_scores(df)
+    finalize_scores(
+        df,
+        off_raw,
+        def_raw,
+        performance,
+        off_raw.max(),
+        def_raw.max(),
+        performance.max(),
+        max(df["Salary"].max(), MAX_SALARY_FLOOR),
+    )
     return df
@@ -0,0 +1,193 @@
+import json
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import TTLCache
+
+from Scripts.utils_nba import metrics_params
+
+# Scénarios "et si" sur les pondérations de compute_metrics. Les
+# caractéristiques normalisées (Perf_*, TS%...) sont figées une fois par
+# version du jeu de données dans une matrice ; un scénario se réduit à un
+# produit matrice-vecteur, et les résultats sont gardés dans un cache borné.
+
+CACHE_SIZE = 128
+CACHE_TTL = 600  # secondes
+
+# Colonne(s) de la matrice pour chaque pondération (moyenne si plusieurs)
+WEIGHT_FEATURES = {
+    "Points": ["Perf_Points"],
+    "TS_Perc": ["TS_Percentage"],
+    "PlusMinus": ["Perf_PlusMinus"],
+    "Assists": ["Perf_Assists"],
+    "Defense": ["Perf_Steals", "Perf_Blocks"],
+    "Rebounds": ["Perf_Rebounds"],
+    "Win": ["Win_Pct"],
+}
+OFFENSIVE_FEATURES = {
+    "Points": "Perf_Points",
+    "Assists": "Perf_Assists",
+    "TS": "TS_Percentage",
+}
+DEFENSIVE_FEATURES = {
+    "Rebounds": "Perf_Rebounds",
+    "Steals": "Perf_Steals",
+    "Blocks": "Perf_Blocks",
+}
+
+_cache = TTLCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+_cache_lock = threading.Lock()
+
+
+class ScenarioError(ValueError):
+    pass
+
+
+def feature_matrices(snapshot):
+    """Matrices (n x k) des caractéristiques, construites une fois par version."""
+
+    def build(df):
+        def column(name):
+            return df[name].to_numpy(dtype=float)
+
+        return {
+            "score": np.column_stack(
+                [
+                    np.mean([column(c) for c in cols], axis=0)
+                    for cols in WEIGHT_FEATURES.values()
+                ]
+            ),
+            "offensive": np.column_stack(
+                [column(c) for c in OFFENSIVE_FEATURES.values()]
+            ),
+            "defensive": np.column_stack(
+                [column(c) for c in DEFENSIVE_FEATURES.values()]
+            ),
+            "minutes": column("Minutes"),
+            "salary": column("Salary"),
+        }
+
+    return snapshot.derived("whatif_features", build)
+
+
+def scenario_params(overrides):
+    """Paramètres par défaut de compute_metrics, complétés par ceux du scénario."""
+    params = json.loads(json.dumps(metrics_params()))
+    if overrides is None:
+        overrides = {}
+    if not isinstance(overrides, dict):
+        raise ScenarioError("The scenario must be a JSON object")
+    for key, value in overrides.items():
+        if key not in params:
+            raise ScenarioError(f"Unknown parameter: {key}")
+        if isinstance(params[key], dict):
+            if not isinstance(value, dict):
+                raise ScenarioError(f"{key} must be an object")
+            unknown = set(value) - set(params[key])
+            if unknown:
+                names = ", ".join(sorted(unknown))
+                raise ScenarioError(f"Unknown {key} entries: {names}")
+            params[key].update({k: _number(v, f"{key}.{k}") for k, v in value.items()})
+        else:
+            params[key] = _number(value, key)
+    if sum(params["weights"].values()) <= 0:
+        raise ScenarioError("The sum of the weights must be positive")
+    if params["minutes_threshold"] <= 0:
+        raise ScenarioError("minutes_threshold must be positive")
+    return params
+
+
+def _number(value, name):
+    # Pondérations, mélanges, seuils, ratios et salaires : finis et positifs
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ScenarioError(f"{name} must be a number")
+    try:
+        number = float(value)
+    except OverflowError:  # Entier JSON trop grand pour un float
+        number = math.inf
+    if not math.isfinite(number):
+        raise ScenarioError(f"{name} must be finite")
+    if number < 0:
+        raise ScenarioError(f"{name} must not be negative")
+    return number
+
+
+def _vector(mix, order):
+    return np.array([mix[key] for key in order], dtype=float)
+
+
+def _impact(raw):
+    top = raw.max()
+    return np.floor(raw / top * 100) if top > 0 else np.zeros_like(raw)
+
+
+def _compute(snapshot, params):
+    m = feature_matrices(snapshot)
+    weights = _vector(params["weights"], WEIGHT_FEATURES)
+
+    # Même formule que compute_metrics, en un produit matrice-vecteur
+    minutes = m["minutes"]
+    threshold = params["minutes_threshold"]
+    minutes_factor = np.where(minutes >= threshold, 1.0, (minutes / threshold) ** 2)
+    performance = np.maximum(0, (m["score"] @ weights) / weights.sum() * minutes_factor)
+
+    max_p = performance.max()
+    target_max = max(m["salary"].max(), params["max_salary_floor"])
+    if max_p > 0:
+        salary_th = np.floor(performance / max_p * target_max)
+    else:
+        salary_th = np.full_like(performance, params["min_salary"])
+    salary_th = np.maximum(salary_th, params["min_salary"])
+
+    ratio = salary_th / (m["salary"] + 1)
+    indicateur = np.full(len(ratio), "🟡 Well paid", dtype=object)
+    indicateur[ratio > params["underpaid_ratio"]] = "🟢 Underpaid"
+    indicateur[ratio < params["overpaid_ratio"]] = "🔴 Overpaid"
+    indicateur[m["salary"] <= 0] = "Unknown"
+
+    return {
+        "Performance_Score": performance,
+        "Salary_th": salary_th,
+        "Indicateur": indicateur,
+        "Offensive_Impact": _impact(
+            m["offensive"] @ _vector(params["offensive_mix"], OFFENSIVE_FEATURES)
+        ),
+        "Defensive_Impact": _impact(
+            m["defensive"] @ _vector(params["defensive_mix"], DEFENSIVE_FEATURES)
+        ),
+    }
+
+
+def run_scenario(snapshot, overrides=None):
+    """Scénario sur toute la ligue, mis en cache par (version, paramètres)."""
+    params = scenario_params(overrides)
+    key = (snapshot.version, json.dumps(params, sort_keys=True))
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return params, cached
+
+    result = _compute(snapshot, params)
+    with _cache_lock:
+        _cache[key] = result
+    return params, result
+
+
+def scenario_records(snapshot, result, positions):
+    """Lignes du scénario, avec les valeurs actuelles (suffixe _before) à côté."""
+    df = snapshot.df
+    positions = np.asarray(positions, dtype=np.intp)
+    frame = pd.DataFrame(
+        {
+            "id": positions,
+            "Player": df["Player"].to_numpy()[positions],
+            "Salary": df["Salary"].to_numpy()[positions],
+        }
+    )
+    for column, values in result.items():
+        frame[column] = values[positions]
+        if column in df.columns:
+            frame[f"{column}_before"] = df[column].to_numpy()[positions]
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
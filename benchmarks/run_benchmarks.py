@@ -0,0 +1,246 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Path setup for imports
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+
+from benchmarks.synthetic import make_league  # noqa: E402
+from Scripts import http_cache, storage, uncertainty  # noqa: E402
+from Scripts.merge_data import _clean_name, merge_salaries  # noqa: E402
+from Scripts.utils_nba import compute_metrics  # noqa: E402
+
+# Banc d'essai : chaque étape est chronométrée (meilleur temps sur N essais),
+# puis relancée une fois sous tracemalloc pour le pic mémoire. Les résultats
+# sont écrits en JSON (un fichier par exécution) pour comparer deux commits :
+#   python benchmarks/run_benchmarks.py --sizes 500,5000,50000
+#   python benchmarks/run_benchmarks.py --compare benchmarks/results/<avant>.json
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_SIZES = "500,5000,50000"
+UNCERTAINTY_CELLS = 5_000_000  # 10k tirages à 500 joueurs
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, repeat):
+    # Meilleur temps sur `repeat` essais, puis un essai supplémentaire pour le pic mémoire
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": round(min(times), 6),
+        "median_seconds": round(float(np.median(times)), 6),
+        "peak_mb": round(peak / 1e6, 3),
+    }
+
+
+## Étapes mesurées
+
+
+def _stage_merge(ctx):
+    def run():
+        _clean_name.cache_clear()  # Matching à froid
+        return merge_salaries(ctx["stats"], ctx["salary"])
+
+    return run
+
+
+def _stage_compute_metrics(ctx):
+    return lambda: compute_metrics(ctx["merged"])
+
+
+def _stage_uncertainty(ctx):
+    # Tirages réduits quand la ligue grandit : joueurs x tirages constant
+    df = ctx["app"].DATASET.df
+    draws = min(uncertainty.DEFAULT_DRAWS, max(UNCERTAINTY_CELLS // len(df), 100))
+    return lambda: uncertainty.simulate(df, draws=draws)
+
+
+def _stage_load_data(ctx):
+    return lambda: ctx["app"].load_data()
+
+
+def _endpoint(path_func, cached=False):
+    # Par défaut, le cache de réponses est vidé avant chaque essai : on mesure
+    # l'endpoint, pas la relecture du corps déjà produit pour cette version
+    def stage(ctx):
+        client = ctx["client"]
+        path = path_func(ctx)
+        if cached:
+            client.get(path)
+
+        def run():
+            if not cached:
+                http_cache.clear_responses()
+            response = client.get(path)
+            assert response.status_code == 200, response.status_code
+            return response.data
+
+        return run
+
+    return stage
+
+
+ENDPOINTS = {
+    "GET /api/players": lambda ctx: "/api/players?q=jok",
+    "GET /api/players/index": lambda ctx: "/api/players/index",
+    "GET /api/player": lambda ctx: f"/api/player?name={ctx['probe']}",
+    "GET /api/leaderboard": (
+        lambda ctx: "/api/leaderboard?sort=Salary_Gap&limit=50&offset=100"
+    ),
+    "GET /api/teams": lambda ctx: "/api/teams",
+    "GET /": lambda ctx: "/",
+}
+
+STAGES = {
+    "merge_salaries": _stage_merge,
+    "compute_metrics": _stage_compute_metrics,
+    "uncertainty": _stage_uncertainty,
+    "load_data": _stage_load_data,
+}
+# Chaque endpoint à froid (calcul complet) et servi depuis le cache de réponses
+for _name, _path in ENDPOINTS.items():
+    STAGES[_name] = _endpoint(_path)
+    STAGES[f"{_name} (cached)"] = _endpoint(_path, cached=True)
+
+
+def _prepare(n, seed, data_dir):
+    df_stats, df_salary = make_league(n, seed)
+    df_merged = merge_salaries(df_stats, df_salary)
+    df_final = compute_metrics(df_merged)
+
+    # Jeu de données synthétique écrit dans un dossier temporaire, puis servi
+    # par l'application comme le vrai
+    storage.DATA_DIR = data_dir
+    storage.save_dataset(df_final, "nba_data")
+    if "nba_app" in sys.modules:
+        app_module = sys.modules["nba_app"]
+        app_module.DATASET = app_module.load_snapshot()
+    else:
+        import nba_app as app_module
+    app_module.app.testing = True  # Pas de rafraîchissement en tâche de fond
+
+    matched = (df_merged["Salary"] > 0).mean()
+    return {
+        "stats": df_stats,
+        "salary": df_salary,
+        "merged": df_merged,
+        "app": app_module,
+        "client": app_module.app.test_client(),
+        "probe": df_final["Player"].iloc[len(df_final) // 2],
+        "match_rate": round(float(matched), 4),
+    }
+
+
+def run_benchmarks(sizes, seed=0, repeat=3, stages=None):
+    names = stages or list(STAGES)
+    results = []
+    data_dir_before = storage.DATA_DIR
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            for n in sizes:
+                ctx = _prepare(n, seed, data_dir)
+                print(f"\n[Bench] {n} joueurs (matching : {ctx['match_rate']:.1%})")
+                for name in names:
+                    stats = measure(STAGES[name](ctx), repeat)
+                    results.append({"stage": name, "rows": n, **stats})
+                    print(
+                        f"[Bench] {name:<31} {stats['seconds']:>9.4f}s"
+                        f"  pic {stats['peak_mb']:>8.1f} Mo"
+                    )
+    finally:
+        # _prepare pointe storage vers le dossier temporaire : on le rétablit
+        storage.DATA_DIR = data_dir_before
+    return results
+
+
+def save_results(results, seed, path=None):
+    commit = _git_commit()
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = path or os.path.join(RESULTS_DIR, f"{stamp}-{commit or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        "meta": {
+            "commit": commit,
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "seed": seed,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n[Bench] Résultats : {path}")
+    return path
+
+
+def compare(previous_path, results):
+    # Ratio temps actuel / temps de référence, par étape et par taille
+    with open(previous_path, encoding="utf-8") as f:
+        previous = {(r["stage"], r["rows"]): r for r in json.load(f)["results"]}
+
+    print(f"\n[Bench] Comparaison avec {os.path.basename(previous_path)}")
+    for r in results:
+        ref = previous.get((r["stage"], r["rows"]))
+        if not ref or not ref["seconds"]:
+            continue
+        ratio = r["seconds"] / ref["seconds"]
+        flag = "  ⚠️ régression" if ratio > 1.2 else ""
+        print(f"[Bench] {r['stage']:<31} {r['rows']:>7}  x{ratio:.2f}{flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks sur ligue synthétique")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="ex. 500,5000,500000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", help=f"sous-ensemble de : {', '.join(STAGES)}")
+    parser.add_argument("--out", help="fichier JSON de sortie")
+    parser.add_argument("--compare", help="résultats JSON de référence")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    stages = args.stages.split(",") if args.stages else None
+    results = run_benchmarks(sizes, args.seed, args.repeat, stages)
+    save_results(results, args.seed, args.out)
+    if args.compare:
+        compare(args.compare, results)
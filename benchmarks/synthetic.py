@@ -0,0 +1,150 @@
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from Scripts.utils_nba import classify_contract
+
+# Générateur de ligue synthétique (graine fixe) au format réel :
+# NBA_Stat (25 colonnes) et NBA_Salary (Player, Salary, Salary_Format, Contract_Type).
+# Les noms reproduisent les cas difficiles du matching : accents, tirets,
+# apostrophes, suffixes Jr/III et noms abrégés en initiale côté salaires.
+
+FIRST_NAMES = [
+    "Luka", "Nikola", "Victor", "Shai", "Giannis", "Jaren", "Trey", "Karl",
+    "Kristaps", "Bogdan", "Dāvis", "Théo", "Jusuf", "Dario", "Bronny", "LeBron",
+    "De'Aaron", "Jean-Luc", "Álex", "Moussa", "Goga", "Tyrese", "Ömer", "Dennis",
+]
+LAST_NAMES = [
+    "Dončić", "Jokić", "Wembanyama", "Gilgeous-Alexander", "Antetokounmpo",
+    "Jackson", "Murphy", "Towns", "Porziņģis", "Bogdanović", "Bertāns", "Maledon",
+    "Nurkić", "Šarić", "James", "Fox", "O'Neale", "Abrines", "Diabaté",
+    "Bitadze", "Haliburton", "Yurtseven", "Schröder", "Valančiūnas",
+]
+SUFFIXES = ["Jr.", "Sr.", "II", "III", "IV"]
+SYLLABLES = ["ka", "lo", "mi", "ro", "ve", "tu", "na", "si", "do", "ré", "zé", "ić"]
+TEAMS = [
+    "ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GSW",
+    "HOU", "IND", "LAC", "LAL", "MEM", "MIA", "MIL", "MIN", "NOP", "NYK",
+    "OKC", "ORL", "PHI", "PHX", "POR", "SAC", "SAS", "TOR", "UTA", "WAS",
+]
+
+MIN_SALARY = 1157153
+MAX_SALARY = 59606817
+
+
+def _tag(i):
+    # Syllabes uniques par joueur (base len(SYLLABLES)), pour des noms distincts
+    out = []
+    while True:
+        i, r = divmod(i, len(SYLLABLES))
+        out.append(SYLLABLES[r])
+        if i == 0:
+            break
+    return "".join(out).capitalize()
+
+
+def make_names(n, rng):
+    first = rng.choice(FIRST_NAMES, n)
+    last = rng.choice(LAST_NAMES, n)
+    suffix = np.where(rng.random(n) < 0.06, rng.choice(SUFFIXES, n), "")
+    names = []
+    for i in range(n):
+        name = f"{first[i]} {last[i]}{_tag(i)}"
+        names.append(f"{name} {suffix[i]}" if suffix[i] else name)
+    return names
+
+
+def _salary_name(name, variant):
+    # Variante du nom telle qu'on la trouve côté salaires
+    parts = name.split()
+    if variant == "initial":
+        return f"{parts[0][0]}. {' '.join(parts[1:])}"
+    if variant == "suffix" and parts[-1] in SUFFIXES:
+        return " ".join(parts[:-1])
+    if variant == "ascii":
+        # Sans accents, en minuscules, sans tirets ni points
+        decomposed = unicodedata.normalize("NFKD", name)
+        plain = "".join(c for c in decomposed if not unicodedata.combining(c))
+        return plain.lower().replace("-", " ").replace(".", "")
+    return name
+
+
+def make_stats(names, rng):
+    n = len(names)
+    games = rng.integers(1, 83, n)
+    wins = rng.integers(0, games + 1)
+    minutes = np.round(rng.uniform(2, 38, n), 1)
+    scale = minutes / 38
+    fga = np.round(rng.uniform(0.5, 22, n) * scale + 0.1, 1)
+    fg_pct = np.round(rng.uniform(0.3, 0.65, n), 3)
+    fgm = np.round(fga * fg_pct, 1)
+    three_m = np.round(np.minimum(fgm, rng.uniform(0, 4.5, n) * scale), 1)
+    ft_pct = np.round(np.where(rng.random(n) < 0.03, 0, rng.uniform(0.5, 0.95, n)), 3)
+    points = np.round(2 * fgm + three_m + rng.uniform(0, 8, n) * scale, 1)
+    oreb = np.round(rng.uniform(0, 4, n) * scale, 1)
+    dreb = np.round(rng.uniform(0, 10, n) * scale, 1)
+    assists = np.round(rng.uniform(0, 11, n) * scale, 1)
+    turnovers = np.round(rng.uniform(0, 4.5, n) * scale, 1)
+
+    df = pd.DataFrame(
+        {
+            "Player": names,
+            "Team": rng.choice(TEAMS, n),
+            "Age": rng.integers(19, 41, n),
+            "Games_Played": games,
+            "Wins": wins,
+            "Losses": games - wins,
+            "Win_Pct": np.round(wins / games, 3),
+            "Minutes": minutes,
+            "Points": points,
+            "Field_Goals_Made": fgm,
+            "Field_Goals_Attempted": fga,
+            "FG_Percentage": fg_pct,
+            "Three_PT_Made": three_m,
+            "Three_PT_Percentage": np.round(rng.uniform(0, 0.45, n), 3),
+            "FT_Percentage": ft_pct,
+            "Offensive_Rebounds": oreb,
+            "Defensive_Rebounds": dreb,
+            "Total_Rebounds": np.round(oreb + dreb, 1),
+            "Assists": assists,
+            "Turnovers": turnovers,
+            "Steals": np.round(rng.uniform(0, 2.2, n) * scale, 1),
+            "Blocks": np.round(rng.uniform(0, 3.5, n) * scale, 1),
+            "Personal_Fouls": np.round(rng.uniform(0, 4, n) * scale, 1),
+            "Plus_Minus": np.round(rng.normal(0, 4, n), 1),
+        }
+    )
+    df["AST_TOV_Ratio"] = np.where(
+        turnovers > 0, np.round(assists / np.where(turnovers > 0, turnovers, 1), 2), 0
+    )
+    return df
+
+
+def make_salaries(names, rng, coverage=0.95):
+    n = len(names)
+    keep = np.flatnonzero(rng.random(n) < coverage)
+    variants = rng.choice(
+        ["exact", "initial", "suffix", "ascii"], len(keep), p=[0.7, 0.15, 0.05, 0.1]
+    )
+    salary = np.round(
+        MIN_SALARY + (MAX_SALARY - MIN_SALARY) * rng.beta(1.2, 4, len(keep))
+    ).astype("int64")
+
+    df = pd.DataFrame(
+        {
+            "Player": [_salary_name(names[i], v) for i, v in zip(keep, variants)],
+            "Salary": salary,
+        }
+    )
+    df["Salary_Format"] = [f"${x:,}" for x in df["Salary"]]
+    df["Contract_Type"] = df["Salary"].map(classify_contract)
+    # Ordre du site : salaires décroissants
+    return df.sort_values("Salary", ascending=False, ignore_index=True)
+
+
+def make_league(n, seed=0):
+    """(df_stats, df_salary) synthétiques pour n joueurs, reproductibles."""
+    rng = np.random.default_rng(seed)
+    names = make_names(n, rng)
+    return make_stats(names, rng), make_salaries(names, rng)
@@ -1,50 +1,187 @@
 import os
-import subprocess
 import sys
+import time
 import webbrowser
-from datetime import datetime
-from threading import Timer
+from threading import Event, Lock, Thread, Timer
 
 import pandas as pd
-from flask import Flask, jsonify, render_template_string, request
+from flask import (
+    Flask,
+    Response,
+    abort,
+    g,
+    jsonify,
+    make_response,
+    render_template_string,
+    request,
+)
+
+from Scripts import (
+    history,
+    http_cache,
+    monitoring,
+    pipeline,
+    rankings,
+    search,
+    serving,
+    table_query,
+    teams,
+    uncertainty,
+    whatif,
+)
+from Scripts.dataset import DatasetSnapshot, name_index
+from Scripts.storage import dataset_version, load_dataset
 
 app = Flask(__name__)
 
 # Config
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_FILE = os.path.join(BASE_DIR, "data", "nba_data.xlsx")
-STATS_FILE = os.path.join(BASE_DIR, "data", "NBA_Stat.xlsx")
-SCRAPER_PATH = os.path.join(BASE_DIR, "Scrapers", "scrapers_stat.py")
-MERGE_PATH = os.path.join(BASE_DIR, "Scripts", "merge_data.py")
-
-
-def check_and_update_data():
-    today = datetime.now().date()
-    if (
-        not os.path.exists(STATS_FILE)
-        or datetime.fromtimestamp(os.path.getmtime(STATS_FILE)).date() < today
-    ):
-        try:
-            py = sys.executable
-            print("🚀 Update in progress...")
-            subprocess.run([py, SCRAPER_PATH], check=True)
-            subprocess.run([py, MERGE_PATH], check=True)
-        except Exception as e:
-            print(f"Update error: {e}")
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 100
+MAX_COMPARE_SIZE = 15
+UNCERTAINTY_WORKERS = int(os.environ.get("NBA_UNCERTAINTY_WORKERS", 0))
+REFRESH_INTERVAL = int(os.environ.get("NBA_REFRESH_INTERVAL", 3600))  # secondes
+# NBA_SERVING=shared : plusieurs workers servent le même fichier Arrow publié
+# (mmap, sans copie) et suivent le pointeur de version (Scripts/serving.py)
+SHARED_SERVING = os.environ.get("NBA_SERVING", "local") == "shared"
+POINTER_CHECK_INTERVAL = 1.0  # secondes entre deux lectures du pointeur
+
+# Réponses d'API qui ne dépendent que de la version du jeu de données et de
+# l'URL (GET sans corps) : ETag, 304 et cache des corps compressés
+VERSIONED_ROUTES = {
+    "/api/players",
+    "/api/players/index",
+    "/api/player",
+    "/api/players/batch",
+    "/api/compare",
+    "/api/leaderboard",
+    "/api/table",
+    "/api/player/percentile",
+    "/api/uncertainty",
+    "/api/teams",
+    "/api/team",
+}
+API_CACHE_CONTROL = "public, max-age=60"
+PAGE_CACHE_CONTROL = "public, no-cache"  # Toujours revalidée (304 si inchangée)
+PAGE = None  # Page rendue et compressée une fois par processus
+ADMIN_TOKEN = os.environ.get("NBA_ADMIN_TOKEN")
+# Profilage échantillonné des routes chaudes, ex. NBA_PROFILE_ROUTES=/api/players,/api/player
+PROFILE_ROUTES = [r for r in os.environ.get("NBA_PROFILE_ROUTES", "").split(",") if r]
+PROFILE_RATE = float(os.environ.get("NBA_PROFILE_RATE", 0.01))
+
+REQUEST_METRICS = monitoring.RequestMetrics()
+PROFILER = (
+    monitoring.SamplingProfiler(PROFILE_ROUTES, PROFILE_RATE) if PROFILE_ROUTES else None
+)
+REFRESH_STATE = {"seconds": None, "success": None, "finished_at": None, "failures": 0}
 
 
-check_and_update_data()
+def check_and_update_data(force=False):
+    # Scrapers, fusion et métriques dans le même processus ; les étapes déjà
+    # à jour sont sautées (voir Scripts/pipeline.py)
+    start = time.perf_counter()
+    success = False
+    try:
+        print("🚀 Update in progress...")
+        reports = pipeline.run_pipeline(force=force)
+        success = not any(r["status"] in ("failed", "blocked") for r in reports)
+    except Exception as e:
+        print(f"Update error: {e}")
+    finally:
+        REFRESH_STATE["seconds"] = time.perf_counter() - start
+        REFRESH_STATE["success"] = success
+        REFRESH_STATE["finished_at"] = time.time()
+        if not success:
+            REFRESH_STATE["failures"] += 1
 
 
 def load_data():
-    if not os.path.exists(DATA_FILE):
-        return pd.DataFrame()
-    df = pd.read_excel(DATA_FILE, sheet_name="Analyse_NBA")
+    df = load_dataset("nba_data")
     df.columns = [str(c).strip() for c in df.columns]
     return df
 
 
-DF = load_data()
+def load_snapshot():
+    start = time.perf_counter()
+    if SHARED_SERVING:
+        version = serving.read_pointer() or serving.publish()
+        df = serving.attach(version) if version else pd.DataFrame()
+    else:
+        df, version = load_data(), dataset_version("nba_data")
+    return DatasetSnapshot(df, version, time.perf_counter() - start)
+
+
+# On sert immédiatement le dernier jeu de données valide ; la mise à jour
+# tourne en tâche de fond et remplace le snapshot d'un seul coup.
+DATASET = load_snapshot()
+
+_refresh_lock = Lock()
+_refresh_requested = Event()
+_swap_lock = Lock()  # Distinct de _refresh_lock : le pipeline peut être long
+_pointer_state = {"checked_at": 0.0}
+_worker_state = {"started": False}
+_worker_lock = Lock()
+
+
+def refresh_dataset(force=False):
+    global DATASET
+    with _refresh_lock:
+        check_and_update_data(force)
+        if SHARED_SERVING:
+            serving.publish()
+        if dataset_version("nba_data") != DATASET.version:
+            DATASET = load_snapshot()
+            print(f"✔ Dataset reloaded (version {DATASET.version})")
+
+
+def follow_pointer():
+    # Mode partagé : bascule sur la version publiée dès que le pointeur change
+    global DATASET
+    now = time.monotonic()
+    if now - _pointer_state["checked_at"] < POINTER_CHECK_INTERVAL:
+        return
+    _pointer_state["checked_at"] = now
+    if serving.read_pointer() in (None, DATASET.version):
+        return
+    with _swap_lock:
+        if serving.read_pointer() != DATASET.version:
+            DATASET = load_snapshot()
+
+
+def _wait_for_refresh():
+    # True si un rafraîchissement a été demandé avant la fin de l'intervalle ;
+    # en mode partagé, la demande peut venir d'un autre worker (marqueur)
+    deadline = time.monotonic() + REFRESH_INTERVAL
+    while time.monotonic() < deadline:
+        remaining = deadline - time.monotonic()
+        poll = min(remaining, 5.0) if SHARED_SERVING else remaining
+        if _refresh_requested.wait(max(poll, 0)):
+            _refresh_requested.clear()
+            return True
+        if SHARED_SERVING and serving.take_refresh_request():
+            return True
+    return False
+
+
+def _refresh_worker():
+    refresh_dataset()
+    while True:
+        forced = _wait_for_refresh()
+        try:
+            refresh_dataset(force=forced)
+        except Exception as e:
+            print(f"Refresh error: {e}")
+
+
+def start_background_refresh():
+    # Une seule fois par processus : lancement direct ou premier appel WSGI
+    if _worker_state["started"]:
+        return
+    with _worker_lock:
+        if _worker_state["started"]:
+            return
+        _worker_state["started"] = True
+    Thread(target=_refresh_worker, name="nba-refresh", daemon=True).start()
+
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -97,11 +234,47 @@ const search = document.getElementById('search');
 const suggestions = document.getElementById('suggestions');
 const content = document.getElementById('content');
 
-search.addEventListener('input', async () => {
+// Index des noms téléchargé une fois (versionné, mis en cache par le navigateur) :
+// la recherche se fait dans la page, le serveur ne sert que les fiches joueur
+let nameIndex = null;
+const fold = s => s.normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase();
+
+async function loadNameIndex() {
+    try {
+        const res = await fetch('/api/players/index');
+        const data = await res.json();
+        nameIndex = data.players.map(([name, id, team]) => ({ name, id, team, key: fold(name) }));
+    } catch (e) { nameIndex = null; }
+}
+
+function matchPlayers(q) {
+    // Début du nom ou d'un mot d'abord, puis sous-chaîne ; 10 résultats
+    const key = fold(q), starts = [], contains = [];
+    for (const p of nameIndex) {
+        const at = p.key.indexOf(key);
+        if (at < 0) continue;
+        if (at === 0 || p.key[at - 1] === ' ') starts.push(p); else contains.push(p);
+        if (starts.length >= 10) break;
+    }
+    return starts.concat(contains).slice(0, 10).map(p => p.name);
+}
+
+let searchTimer = null;
+search.addEventListener('input', () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(suggest, 120);
+});
+
+async function suggest() {
     const q = search.value.trim();
     if (q.length < 2) { suggestions.style.display = 'none'; return; }
-    const res = await fetch(`/api/players?q=${encodeURIComponent(q)}`);
-    const players = await res.json();
+    let players;
+    if (nameIndex) {
+        players = matchPlayers(q);
+    } else {
+        const res = await fetch(`/api/players?q=${encodeURIComponent(q)}`);
+        players = await res.json();
+    }
     suggestions.innerHTML = "";
     players.forEach(p => {
         const div = document.createElement('div');
@@ -110,7 +283,8 @@ search.addEventListener('input', async () => {
         suggestions.appendChild(div);
     });
     suggestions.style.display = 'block';
-});
+}
+loadNameIndex();
 
 async function loadPlayer(name) {
     suggestions.style.display = 'none'; search.value = name;
@@ -186,28 +360,483 @@ function pct(v) { return v ? (v * 100).toFixed(1) + '%' : '0%'; }
 
 @app.route("/api/players")
 def get_players():
-    q = request.args.get("q", "").lower()
-    return jsonify(
-        DF[DF["Player"].str.lower().str.contains(q, na=False)]["Player"]
-        .unique()
-        .tolist()[:10]
-    )
+    # Meilleurs noms pour la requête (accents, fautes de frappe, débuts de mots)
+    snapshot = DATASET
+    if snapshot.df.empty:
+        return jsonify([])
+    limit = min(max(request.args.get("limit", 10, type=int), 1), MAX_PAGE_SIZE)
+    index = search.search_index(snapshot)
+    return jsonify(index.search(request.args.get("q", ""), limit))
+
+
+@app.route("/api/players/index")
+def get_players_index():
+    # Index compact pour la recherche côté navigateur : [nom, id, équipe]
+    snapshot = DATASET
+    players = snapshot.derived("client_name_index", _client_name_index)
+    return jsonify({"version": snapshot.version, "players": players})
+
+
+def _client_name_index(df):
+    if df.empty:
+        return []
+    teams = df["Team"].astype(object).where(df["Team"].notna(), None)
+    return [
+        [name, pos, team]
+        for pos, (name, team) in enumerate(zip(df["Player"], teams))
+        if pd.notna(name)
+    ]
+
+
+def _records(df, positions):
+    rows = df.iloc[positions]
+    return rows.astype(object).where(rows.notna(), None).to_dict("records")
 
 
 @app.route("/api/player")
 def get_player():
-    name = request.args.get("name")
-    match = DF[DF["Player"] == name]
-    if match.empty:
+    snapshot = DATASET
+    if snapshot.df.empty:
+        return jsonify({"error": "Not found"})
+    pos = name_index(snapshot).get(request.args.get("name"))
+    if pos is None:
+        return jsonify({"error": "Not found"})
+    return jsonify(_records(snapshot.df, [pos])[0])
+
+
+def _bad_request(message):
+    # Interrompt la requête : erreur 400 en JSON
+    abort(make_response(jsonify({"error": message}), 400))
+
+
+def _request_payload():
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return {}
+    if not isinstance(payload, dict):
+        _bad_request("JSON body must be an object")
+    return payload
+
+
+def _requested_players(snapshot):
+    # Noms et/ou identifiants (ligne dans la version courante), en query string
+    # (?names=a,b&ids=1,2) ou en JSON ({"names": [...], "ids": [...]})
+    payload = _request_payload()
+    names = payload.get("names") or request.args.get("names", "").split(",")
+    ids = payload.get("ids") or request.args.get("ids", "").split(",")
+    if not isinstance(names, list) or not isinstance(ids, list):
+        _bad_request("names and ids must be lists")
+    if not all(isinstance(name, str) for name in names):
+        _bad_request("names must be strings")
+
+    index = name_index(snapshot)
+    positions, missing = [], []
+    for name in filter(None, names):
+        pos = index.get(name)
+        if pos is None:
+            missing.append(name)
+        else:
+            positions.append(pos)
+    for player_id in filter(lambda i: i != "", ids):
+        try:
+            pos = int(player_id)
+        except (TypeError, ValueError):
+            pos = -1
+        if 0 <= pos < len(snapshot.df):
+            positions.append(pos)
+        else:
+            missing.append(player_id)
+    return positions, missing
+
+
+@app.route("/api/players/batch", methods=["GET", "POST"])
+def get_players_batch():
+    snapshot = DATASET
+    if snapshot.df.empty:
+        return jsonify({"error": "No data"}), 503
+    positions, missing = _requested_players(snapshot)
+    if len(positions) + len(missing) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} players per batch"}), 400
+
+    players = _records(snapshot.df, positions) if positions else []
+    for pos, record in zip(positions, players):
+        record["id"] = pos
+    return jsonify({"version": snapshot.version, "players": players, "missing": missing})
+
+
+@app.route("/api/compare", methods=["GET", "POST"])
+def compare_players():
+    snapshot = DATASET
+    if snapshot.df.empty:
+        return jsonify({"error": "No data"}), 503
+    positions, missing = _requested_players(snapshot)
+    if missing:
+        return jsonify({"error": "Not found", "missing": missing}), 404
+    if not 2 <= len(positions) <= MAX_COMPARE_SIZE:
+        return jsonify({"error": f"Compare 2 to {MAX_COMPARE_SIZE} players"}), 400
+
+    available = rankings.sortable_columns(snapshot)
+    columns = request.args.get("columns")
+    if columns:
+        # Colonne demandée inconnue : 400, comme /api/player/percentile
+        columns = columns.split(",")
+        unknown = [c for c in columns if c not in available]
+        if unknown:
+            return jsonify({"error": f"Unknown column: {', '.join(unknown)}"}), 400
+    else:
+        columns = [c for c in rankings.COMPARE_COLUMNS if c in available]
+    return jsonify(
+        {
+            "version": snapshot.version,
+            "players": snapshot.df["Player"].iloc[positions].tolist(),
+            "ids": positions,
+            "columns": columns,
+            **rankings.compare(snapshot, positions, columns),
+        }
+    )
+
+
+@app.route("/api/leaderboard")
+def get_leaderboard():
+    snapshot = DATASET
+    sort = request.args.get("sort", "Performance_Score")
+    # Avant le premier rafraîchissement : page vide, comme /api/teams
+    if not snapshot.df.empty and sort not in rankings.sortable_columns(snapshot):
+        return jsonify({"error": f"Unknown column: {sort}"}), 400
+    order = request.args.get("order", "desc")
+    limit = min(max(request.args.get("limit", 20, type=int), 0), MAX_PAGE_SIZE)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    players = []
+    if not snapshot.df.empty:
+        players = rankings.leaderboard(snapshot, sort, order != "asc", limit, offset)
+    return jsonify(
+        {
+            "sort": sort,
+            "order": "asc" if order == "asc" else "desc",
+            "offset": offset,
+            "limit": limit,
+            "total": len(snapshot.df),
+            "version": snapshot.version,
+            "players": players,
+        }
+    )
+
+
+@app.route("/api/table")
+def get_table():
+    snapshot = DATASET
+    if snapshot.df.empty:
+        return jsonify({"total": 0, "columns": [], "rows": [], "next_cursor": None})
+    columns = request.args.get("columns")
+    limit = min(max(request.args.get("limit", 50, type=int), 1), MAX_PAGE_SIZE)
+    try:
+        result = table_query.query_table(
+            snapshot,
+            request.args,
+            columns=columns.split(",") if columns else None,
+            limit=limit,
+            cursor=request.args.get("cursor"),
+        )
+    except table_query.QueryError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"version": snapshot.version, **result})
+
+
+@app.route("/api/teams")
+def get_teams():
+    snapshot = DATASET
+    sort = request.args.get("sort", "Surplus")
+    order = request.args.get("order", "desc")
+    try:
+        rows = teams.list_teams(snapshot, sort, order != "asc")
+    except KeyError:
+        return jsonify({"error": f"Unknown column: {sort}"}), 400
+    return jsonify({"version": snapshot.version, "sort": sort, "teams": rows})
+
+
+@app.route("/api/team")
+def get_team():
+    snapshot = DATASET
+    top = min(max(request.args.get("top", teams.TOP_CONTRIBUTORS, type=int), 1), 50)
+    team = teams.team_detail(snapshot, request.args.get("code", ""), top)
+    if team is None:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify({"version": snapshot.version, **team})
+
+
+@app.route("/api/whatif", methods=["GET", "POST"])
+def what_if():
+    # Pondérations alternatives en JSON, ex. {"weights": {"Points": 20},
+    # "minutes_threshold": 20} ; names/ids restreignent la réponse
+    snapshot = DATASET
+    if snapshot.df.empty:
+        return jsonify({"error": "No data"}), 503
+    payload = request.get_json(silent=True) or {}
+    if isinstance(payload, dict):
+        overrides = {k: v for k, v in payload.items() if k not in ("names", "ids")}
+    else:
+        overrides = payload  # Refusé par whatif (ScenarioError, 400)
+    try:
+        params, result = whatif.run_scenario(snapshot, overrides)
+    except whatif.ScenarioError as e:
+        return jsonify({"error": str(e)}), 400
+
+    positions, missing = _requested_players(snapshot)
+    if missing:
+        return jsonify({"error": "Not found", "missing": missing}), 404
+    if not positions:
+        positions = range(len(snapshot.df))
+    players = whatif.scenario_records(snapshot, result, positions)
+    changed = sum(p["Indicateur"] != p["Indicateur_before"] for p in players)
+    return jsonify(
+        {
+            "version": snapshot.version,
+            "params": params,
+            "changed": changed,
+            "players": players,
+        }
+    )
+
+
+@app.route("/api/uncertainty", methods=["GET", "POST"])
+def get_uncertainty():
+    # Bandes de Salary_th et probabilités d'Indicateur (Monte Carlo), gardées
+    # dans un cache borné par version du jeu de données et nombre de tirages
+    snapshot = DATASET
+    if snapshot.df.empty:
+        return jsonify({"error": "No data"}), 503
+    draws = request.args.get("draws", uncertainty.DEFAULT_DRAWS, type=int)
+    if draws not in uncertainty.DRAW_PRESETS:
+        presets = ", ".join(map(str, uncertainty.DRAW_PRESETS))
+        return jsonify({"error": f"draws must be one of {presets}"}), 400
+    positions, missing = _requested_players(snapshot)
+    if missing:
+        return jsonify({"error": "Not found", "missing": missing}), 404
+
+    bands = uncertainty.snapshot_bands(snapshot, draws, workers=UNCERTAINTY_WORKERS)
+    rows = bands.iloc[positions] if positions else bands
+    players = rows.astype(object).where(rows.notna(), None).to_dict("records")
+    return jsonify({"version": snapshot.version, "draws": draws, "players": players})
+
+
+@app.route("/api/player/percentile")
+def get_player_percentile():
+    snapshot = DATASET
+    if snapshot.df.empty:
         return jsonify({"error": "Not found"})
-    return jsonify(match.iloc[0].where(pd.notna(match.iloc[0]), None).to_dict())
+    pos = name_index(snapshot).get(request.args.get("name"))
+    if pos is None:
+        return jsonify({"error": "Not found"})
+
+    available = rankings.sortable_columns(snapshot)
+    columns = request.args.get("columns")
+    columns = columns.split(",") if columns else available
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        return jsonify({"error": f"Unknown column: {', '.join(unknown)}"}), 400
+    return jsonify(
+        {
+            "player": snapshot.df["Player"].iat[pos],
+            "percentiles": {c: rankings.percentile(snapshot, pos, c) for c in columns},
+        }
+    )
+
+
+@app.route("/api/player/history")
+def get_player_history():
+    name = request.args.get("name")
+    if not name:
+        return jsonify({"error": "Missing name"}), 400
+    columns = request.args.get("columns")
+    try:
+        df = history.player_history(
+            name,
+            start=request.args.get("from"),
+            end=request.args.get("to"),
+            columns=columns.split(",") if columns else None,
+        )
+    except history.HistoryError as e:
+        return jsonify({"error": str(e)}), 400
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    return jsonify({"player": name, "history": records})
 
 
 @app.route("/")
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    global PAGE
+    if PAGE is None:
+        PAGE = http_cache.StaticPage(render_template_string(HTML_TEMPLATE))
+    if http_cache.etag_matches(request.headers.get("If-None-Match"), PAGE.etag):
+        return _not_modified(PAGE.etag, PAGE_CACHE_CONTROL)
+    encoding = http_cache.accepted_encoding(request.headers.get("Accept-Encoding"))
+    if encoding not in PAGE.bodies:
+        encoding = "identity"
+    return _encoded_response(
+        PAGE.body(encoding),
+        encoding,
+        "text/html; charset=utf-8",
+        PAGE.etag,
+        PAGE_CACHE_CONTROL,
+    )
+
+
+## Cache HTTP
+
+
+def _encoded_response(body, encoding, mimetype, etag, cache_control):
+    response = Response(body, mimetype=mimetype)
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def _not_modified(etag, cache_control):
+    response = Response(status=304)
+    response.vary.add("Accept-Encoding")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def _versioned_etag():
+    if request.method != "GET" or request.content_length:
+        return None
+    if _route() not in VERSIONED_ROUTES:
+        return None
+    return http_cache.api_etag(DATASET.version, request.full_path)
+
+
+## Instrumentation
+
+
+def _route():
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+@app.before_request
+def _sync_dataset():
+    if SHARED_SERVING:
+        follow_pointer()
+    elif not app.testing:
+        # Sous un serveur WSGI (gunicorn nba_app:app), __main__ n'est pas
+        # exécuté : le rafraîchissement démarre à la première requête
+        start_background_refresh()
+
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+    g.profile = PROFILER.start(_route()) if PROFILER else None
+
+
+@app.before_request
+def _serve_cached():
+    # 304 ou corps déjà produit pour cette version : l'endpoint n'est pas appelé
+    g.etag = _versioned_etag()
+    if g.etag is None:
+        return None
+    if http_cache.etag_matches(request.headers.get("If-None-Match"), g.etag):
+        g.cache_hit = True
+        return _not_modified(g.etag, API_CACHE_CONTROL)
+    accepted = http_cache.accepted_encoding(request.headers.get("Accept-Encoding"))
+    cached = http_cache.cached_body(g.etag, accepted)
+    if cached is not None:
+        g.cache_hit = True
+        body, encoding = cached
+        return _encoded_response(
+            body, encoding, "application/json", g.etag, API_CACHE_CONTROL
+        )
+    return None
+
+
+@app.after_request
+def _record_request(response):
+    # Enregistré avant _compress_api : Flask exécute les after_request dans
+    # l'ordre inverse, la latence mesurée inclut donc la compression
+    if g.get("profile") is not None:
+        PROFILER.stop(_route(), g.profile)
+    start = g.get("request_start")
+    if start is not None:
+        REQUEST_METRICS.observe(
+            _route(), request.method, response.status_code, time.perf_counter() - start
+        )
+    return response
+
+
+@app.after_request
+def _compress_api(response):
+    # Compression des réponses JSON volumineuses ; mise en cache si versionnée
+    if g.get("cache_hit") or not request.path.startswith("/api/"):
+        return response
+    if response.status_code != 200 or response.direct_passthrough:
+        return response
+    if "Content-Encoding" in response.headers:
+        return response
+
+    accepted = http_cache.accepted_encoding(request.headers.get("Accept-Encoding"))
+    body = response.get_data()
+    encoding = accepted if len(body) >= http_cache.MIN_COMPRESS_BYTES else "identity"
+    if encoding != "identity":
+        body = http_cache.compress(body, encoding)
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+
+    etag = g.get("etag")
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = API_CACHE_CONTROL
+        # Pas de mise en cache si le jeu de données a changé pendant la requête
+        if etag == _versioned_etag():
+            http_cache.store_body(etag, accepted, body, encoding)
+    return response
+
+
+@app.route("/metrics")
+def metrics():
+    lines = REQUEST_METRICS.render()
+    lines += monitoring.dataset_metrics(DATASET)
+    lines += monitoring.refresh_metrics(REFRESH_STATE)
+    lines += monitoring.pipeline_metrics(pipeline.LAST_REPORT)
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+def _admin_allowed():
+    # Jeton obligatoire s'il est configuré ; sinon, requêtes locales seulement
+    if ADMIN_TOKEN:
+        return request.headers.get("X-Admin-Token") == ADMIN_TOKEN
+    return request.remote_addr in ("127.0.0.1", "::1")
+
+
+@app.route("/admin/profile")
+def admin_profile():
+    if not _admin_allowed():
+        return jsonify({"error": "Forbidden"}), 403
+    if PROFILER is None:
+        return jsonify({"error": "Profiling disabled (NBA_PROFILE_ROUTES)"}), 404
+    route = request.args.get("route", "/api/players")
+    return Response(PROFILER.report(route), mimetype="text/plain")
+
+
+@app.route("/admin/refresh", methods=["POST"])
+def admin_refresh():
+    if not _admin_allowed():
+        return jsonify({"error": "Forbidden"}), 403
+    if SHARED_SERVING:
+        serving.request_refresh()  # Pris en charge par le processus de publication
+    _refresh_requested.set()
+    return jsonify({"status": "scheduled", "version": DATASET.version}), 202
 
 
 if __name__ == "__main__":
+    if "--publish" in sys.argv:
+        # Processus de publication seul (mode partagé) : rafraîchit et publie,
+        # les workers (ex. gunicorn -w 4 nba_app:app) suivent le pointeur
+        SHARED_SERVING = True
+        _refresh_worker()
+    start_background_refresh()
     Timer(1.5, lambda: webbrowser.open("http://127.0.0.1:5000")).start()
     app.run(debug=False, port=5000, use_reloader=False)
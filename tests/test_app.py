@@ -0,0 +1,206 @@
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+from cachetools import LRUCache, TTLCache
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nba_app  # noqa: E402
+from benchmarks.synthetic import make_league  # noqa: E402
+from Scripts import http_cache, uncertainty  # noqa: E402
+from Scripts.dataset import DatasetSnapshot  # noqa: E402
+from Scripts.merge_data import merge_salaries  # noqa: E402
+from Scripts.utils_nba import compute_metrics  # noqa: E402
+
+# Endpoints testés via le client Flask, sur une petite ligue synthétique
+# (aucun rafraîchissement en tâche de fond en mode testing).
+
+
+@pytest.fixture(scope="module")
+def league():
+    df_stats, df_salary = make_league(120, seed=5)
+    return compute_metrics(merge_salaries(df_stats, df_salary))
+
+
+def _client(monkeypatch, df, version):
+    monkeypatch.setattr(nba_app.app, "testing", True)
+    monkeypatch.setattr(nba_app, "DATASET", DatasetSnapshot(df, version))
+    monkeypatch.setattr(http_cache, "_responses", LRUCache(maxsize=64))
+    return nba_app.app.test_client()
+
+
+@pytest.fixture
+def client(monkeypatch, league):
+    return _client(monkeypatch, league, "test-v1")
+
+
+@pytest.fixture
+def empty_client(monkeypatch):
+    return _client(monkeypatch, pd.DataFrame(), None)
+
+
+def test_leaderboard_page(client, league):
+    body = client.get("/api/leaderboard?sort=Points&limit=5").get_json()
+
+    assert body["total"] == len(league)
+    assert [p["Points"] for p in body["players"]] == sorted(
+        league["Points"], reverse=True
+    )[:5]
+
+
+def test_leaderboard_unknown_column(client):
+    response = client.get("/api/leaderboard?sort=Bogus")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Unknown column: Bogus"
+
+
+def test_leaderboard_empty_dataset(empty_client):
+    response = empty_client.get("/api/leaderboard")
+
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 0
+    assert response.get_json()["players"] == []
+
+
+def test_batch_by_names_and_ids(client, league):
+    names = league["Player"].iloc[[3, 7]].tolist()
+    response = client.post("/api/players/batch", json={"names": names, "ids": [10]})
+
+    body = response.get_json()
+    assert [p["id"] for p in body["players"]] == [3, 7, 10]
+    assert body["missing"] == []
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [["Luka Dončić"], {"names": "Luka Dončić"}, {"names": [1, 2]}],
+)
+def test_batch_bad_payload(client, payload):
+    assert client.post("/api/players/batch", json=payload).status_code == 400
+
+
+def test_compare_unknown_column(client, league):
+    names = ",".join(league["Player"].iloc[:2])
+    response = client.get(f"/api/compare?names={names}&columns=Points,Bogus")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Unknown column: Bogus"
+
+
+@pytest.mark.parametrize("path", ["/api/players/batch?ids=0", "/api/compare?ids=0,1"])
+def test_no_data(empty_client, path):
+    assert empty_client.get(path).status_code == 503
+
+
+def test_table_filters_and_projection(client, league):
+    body = client.get("/api/table?min_Points=10&columns=Player,Points").get_json()
+
+    assert body["total"] == int((league["Points"] >= 10).sum())
+    assert body["columns"] == ["Player", "Points"]
+    assert all(row["Points"] >= 10 for row in body["rows"])
+
+
+@pytest.mark.parametrize("query", ["min_Bogus=1", "columns=Player,Bogus"])
+def test_table_unknown_column(client, query):
+    response = client.get(f"/api/table?{query}")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Unknown column: Bogus"
+
+
+def test_whatif_default_scenario(client, league):
+    body = client.post("/api/whatif", json={"ids": [0, 1]}).get_json()
+
+    assert body["changed"] == 0
+    assert [p["Salary_th"] for p in body["players"]] == league["Salary_th"][:2].tolist()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"weights": {"Points": float("nan")}},
+        {"weights": {"Points": -1}},
+        ["weights"],
+    ],
+)
+def test_whatif_bad_scenario(client, payload):
+    assert client.post("/api/whatif", json=payload).status_code == 400
+
+
+@pytest.fixture
+def simulations(monkeypatch):
+    # simulate() lent et compté, cache des bandes vidé
+    calls = []
+
+    def simulate(df, draws, workers=0):
+        calls.append(draws)
+        time.sleep(0.2)
+        return pd.DataFrame({"Player": df["Player"], "P_Overpaid": 0.5})
+
+    monkeypatch.setattr(uncertainty, "simulate", simulate)
+    monkeypatch.setattr(uncertainty, "_cache", TTLCache(maxsize=16, ttl=600))
+    return calls
+
+
+@pytest.mark.parametrize("draws", [1, 49999, 50000])
+def test_uncertainty_draws_presets(client, simulations, draws):
+    response = client.get(f"/api/uncertainty?draws={draws}")
+
+    assert response.status_code == 400
+    assert simulations == []
+
+
+def test_uncertainty_concurrent_requests_compute_once(client, simulations):
+    statuses = []
+
+    def request():
+        response = nba_app.app.test_client().get("/api/uncertainty?draws=1000&ids=0")
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.get("/api/uncertainty?draws=1000&ids=1")
+
+    assert statuses == [200] * 4
+    assert simulations == [1000]
+
+
+def test_etag_not_modified(client, monkeypatch, league):
+    etag = client.get("/api/teams").headers["ETag"]
+
+    response = client.get("/api/teams", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    # Nouvelle version du jeu de données : nouvel ETag, corps recalculé
+    monkeypatch.setattr(nba_app, "DATASET", DatasetSnapshot(league, "test-v2"))
+    response = client.get("/api/teams", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["version"] == "test-v2"
+
+
+def test_players_index(client, monkeypatch, league):
+    df = league.copy()
+    df.loc[4, "Team"] = None
+    monkeypatch.setattr(nba_app, "DATASET", DatasetSnapshot(df, "test-v3"))
+
+    response = client.get("/api/players/index")
+    body = response.get_json()
+    assert body["version"] == "test-v3"
+    assert len(body["players"]) == len(df)
+    assert body["players"][4] == [df["Player"].iat[4], 4, None]
+    assert response.headers["Cache-Control"] == nba_app.API_CACHE_CONTROL
+
+    # Index volumineux : compressé si le client l'accepte, même ETag
+    gzipped = client.get("/api/players/index", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] == response.headers["ETag"]
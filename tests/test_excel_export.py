@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scripts import excel_export  # noqa: E402
+
+# L'export write-only doit relire exactement comme un to_excel : mêmes valeurs,
+# NaN en cellule vide, lignes de tous les blocs.
+
+
+@pytest.fixture
+def frame():
+    n = 25
+    return pd.DataFrame(
+        {
+            "Player": [f"Joueur {i}" for i in range(n)],
+            "Points": np.round(np.linspace(0, 30, n), 1),
+            "Salary": np.arange(n, dtype="int64") * 1_000_000,
+            "Team": [np.nan if i % 7 == 0 else "BOS" for i in range(n)],
+        }
+    )
+
+
+@pytest.mark.parametrize("styled", [True, False])
+def test_round_trip(frame, tmp_path, monkeypatch, styled):
+    monkeypatch.setattr(excel_export, "CHUNK_ROWS", 10)  # Plusieurs blocs
+    path = tmp_path / "out.xlsx"
+
+    excel_export.write_excel(frame, str(path), "Stats", styled=styled)
+
+    pd.testing.assert_frame_equal(pd.read_excel(path, sheet_name="Stats"), frame)
+
+
+def test_styles(frame, tmp_path):
+    path = tmp_path / "out.xlsx"
+    excel_export.write_excel(frame, str(path), "Stats")
+
+    ws = load_workbook(path)["Stats"]
+    assert ws["A1"].style == "nba_header"
+    assert ws["A1"].font.bold
+    assert ws["A2"].style == "nba_even"
+    assert ws["A3"].style == "nba_odd"
+    assert ws.freeze_panes == "A2"
@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scripts import history  # noqa: E402
+
+DAYS = ["2026-01-10", "2026-01-11", "2026-01-12"]
+
+
+@pytest.fixture
+def partitions(tmp_path, monkeypatch):
+    # Trois jours d'historique dans un dossier temporaire, caches vidés
+    monkeypatch.setattr(history, "HISTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(history, "_listing", {"mtime": None, "days": []})
+    monkeypatch.setattr(history, "_tables", {})
+    monkeypatch.setattr(history, "_combined_cache", {})
+    for i, day in enumerate(DAYS):
+        df = pd.DataFrame(
+            {
+                "Player": ["Luka Dončić", "Nikola Jokić"],
+                "Team": ["LAL", "DEN"],
+                "Performance_Score": [0.8 + i / 100, 0.9],
+                "Salary_th": [50_000_000.0 + i, 55_000_000.0],
+            }
+        )
+        history.append_snapshot(df, day=day)
+    return tmp_path
+
+
+def test_from_prunes_earlier_partitions(partitions):
+    df = history.player_history("Luka Dončić", start=DAYS[1])
+
+    assert df["Date"].tolist() == DAYS[1:]
+    assert df["Performance_Score"].tolist() == pytest.approx([0.81, 0.82])
+
+
+def test_date_range_and_projection(partitions):
+    df = history.player_history(
+        "Nikola Jokić", start=DAYS[0], end=DAYS[1], columns=["Date", "Team"]
+    )
+
+    assert list(df.columns) == ["Date", "Team"]
+    assert df.to_dict("records") == [
+        {"Date": DAYS[0], "Team": "DEN"},
+        {"Date": DAYS[1], "Team": "DEN"},
+    ]
+
+
+def test_empty_range(partitions):
+    assert history.player_history("Luka Dončić", start=DAYS[2], end=DAYS[0]).empty
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"start": "yesterday"},
+        {"end": "2026-13-01"},
+        {"columns": ["Team", "Bogus"]},
+    ],
+)
+def test_invalid_input(partitions, kwargs):
+    with pytest.raises(history.HistoryError):
+        history.player_history("Luka Dončić", **kwargs)
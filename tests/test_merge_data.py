@@ -0,0 +1,147 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_league  # noqa: E402
+from Scripts import manifest, storage  # noqa: E402
+from Scripts.merge_data import (  # noqa: E402
+    clean_name,
+    load_merge_inputs,
+    merge_salaries,
+    merge_salaries_incremental,
+    merge_step,
+)
+
+# Le matching indexé doit donner les mêmes salaires que la boucle d'origine
+# (parcours de tous les salaires pour chaque joueur).
+
+
+def reference_merge(df_stats, df_salary):
+    salary_dict = {}
+    for _, row in df_salary.iterrows():
+        salary_dict[clean_name(str(row["Player"]))] = {
+            "val": row["Salary"],
+            "type": row.get("Contract_Type", "Standard"),
+        }
+
+    salaries, types = [], []
+    for name in df_stats["Player"]:
+        c_name = clean_name(str(name))
+        parts = c_name.split()
+        found_sal, found_type = 0, "Standard"
+        if c_name in salary_dict:
+            found_sal = salary_dict[c_name]["val"]
+            found_type = salary_dict[c_name]["type"]
+        else:
+            for norm_key, data in salary_dict.items():
+                key_parts = norm_key.split()
+                if len(parts) >= 2 and len(key_parts) >= 2:
+                    if parts[-1] == key_parts[-1] and parts[0][0] == key_parts[0][0]:
+                        if (
+                            len(parts[0]) > 1
+                            and len(key_parts[0]) > 1
+                            and parts[0] != key_parts[0]
+                        ):
+                            continue
+                        found_sal, found_type = data["val"], data["type"]
+                        break
+        salaries.append(found_sal)
+        types.append(found_type)
+
+    df = df_stats.copy()
+    df["Salary"] = salaries
+    df["Contract_Type"] = types
+    return df
+
+
+@pytest.fixture
+def league():
+    return make_league(600, seed=3)
+
+
+def test_indexed_merge_matches_reference(league):
+    df_stats, df_salary = league
+    expected = reference_merge(df_stats, df_salary)
+
+    pd.testing.assert_frame_equal(merge_salaries(df_stats, df_salary), expected)
+
+
+def test_difficult_names():
+    df_stats = pd.DataFrame(
+        {
+            "Player": [
+                "Luka Dončić",
+                "Victor Wembanyama",
+                "Bronny James",
+                "LeBron James",
+                "Michael Porter Jr.",
+                "Unknown Player",
+            ]
+        }
+    )
+    df_salary = pd.DataFrame(
+        {
+            "Player": [
+                "Luka Doncic",
+                "V. Wembanyama",
+                "LeBron James",
+                "Michael Porter",
+            ],
+            "Salary": [43_031_940, 12_768_960, 48_728_845, 38_333_050],
+            "Contract_Type": ["Standard", "Rookie Scale", "Max / Supermax", "Standard"],
+        }
+    )
+    merged = merge_salaries(df_stats, df_salary)
+
+    assert merged["Salary"].tolist() == [
+        43_031_940,
+        12_768_960,
+        0,  # Bronny : l'initiale ne correspond pas à LeBron
+        48_728_845,
+        38_333_050,
+        0,
+    ]
+    pd.testing.assert_frame_equal(merged, reference_merge(df_stats, df_salary))
+
+
+def test_incremental_merge_matches_full_merge(league):
+    df_stats, df_salary = league
+    previous = merge_salaries(df_stats, df_salary)
+
+    updated = df_stats.copy()
+    updated.loc[[5, 50, 500], "Points"] += 1.5
+    updated.loc[7, "Player"] = df_salary["Player"].iloc[0]  # Nouveau joueur
+    merged, changed = merge_salaries_incremental(updated, df_salary, previous)
+
+    assert changed == 4
+    pd.testing.assert_frame_equal(merged, merge_salaries(updated, df_salary))
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(manifest, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    return tmp_path
+
+
+def test_merge_step_ignores_edited_output(league, data_dir):
+    df_stats, df_salary = league
+    storage.save_dataset(df_stats, "NBA_Stat")
+    storage.save_dataset(df_salary, "NBA_Salary")
+    merge_step()
+
+    # nba_merged modifié hors pipeline, puis nouvelles stats
+    edited = storage.load_dataset("nba_merged")
+    edited.loc[0, "Salary"] = 1
+    storage.save_dataset(edited, "nba_merged")
+    df_stats.loc[1, "Points"] += 1.0
+    storage.save_dataset(df_stats, "NBA_Stat")
+
+    merged, changed = merge_step()
+    assert changed
+    assert merged["Salary"].iat[0] != 1
+    pd.testing.assert_frame_equal(merged, merge_salaries(*load_merge_inputs()))
@@ -0,0 +1,75 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_league  # noqa: E402
+from Scripts.merge_data import merge_salaries  # noqa: E402
+from Scripts.metrics_engine import IncrementalMetrics  # noqa: E402
+from Scripts.utils_nba import compute_metrics  # noqa: E402
+
+# Le moteur incrémental doit donner exactement le résultat d'un compute_metrics
+# complet, après chaque mise à jour d'un joueur.
+
+DELTA_COLUMNS = [
+    "Points",
+    "Assists",
+    "Total_Rebounds",
+    "Steals",
+    "Blocks",
+    "Plus_Minus",
+    "Minutes",
+    "Win_Pct",
+    "Field_Goals_Attempted",
+]
+
+
+@pytest.fixture
+def merged():
+    df_stats, df_salary = make_league(200, seed=1)
+    return merge_salaries(df_stats, df_salary)
+
+
+def _random_changes(rng, base, pos):
+    changes = {}
+    for column in rng.choice(DELTA_COLUMNS, rng.integers(1, 4), replace=False):
+        if column == "Win_Pct":
+            changes[column] = round(rng.uniform(0, 1), 3)
+            continue
+        current = float(base[column].iat[pos])
+        if rng.random() < 0.1:
+            # Nouveau maximum de la ligue : recalcul complet
+            value = float(base[column].abs().max()) + rng.uniform(0.1, 5)
+        elif column == "Plus_Minus":
+            value = current + rng.normal(0, 3)
+        else:
+            value = max(0.0, current + rng.normal(0, 2))
+        changes[column] = round(value, 1)
+    return changes
+
+
+def test_random_deltas_match_full_compute(merged):
+    rng = np.random.default_rng(7)
+    engine = IncrementalMetrics(merged)
+
+    for _ in range(300):
+        pos = rng.integers(len(engine.base))  # Entier numpy
+        player = engine.base["Player"].iat[pos] if rng.random() < 0.3 else pos
+        engine.apply_delta(player, _random_changes(rng, engine.base, pos))
+
+        pd.testing.assert_frame_equal(engine.df, compute_metrics(engine.base))
+
+    # La plupart des mises à jour ne repassent pas par le calcul complet
+    assert engine.full_recomputes < 150
+
+
+def test_numpy_integer_position(merged):
+    engine = IncrementalMetrics(merged)
+    row = engine.apply_delta(np.int64(3), {"Points": 1.0})
+
+    assert row["Player"] == merged["Player"].iat[3]
+    assert engine.base["Points"].iat[3] == 1.0
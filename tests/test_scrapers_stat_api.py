@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scrapers import scrapers_stat_api  # noqa: E402
+
+# Le client JSON est testé contre un serveur HTTP local qui renvoie une réponse
+# synthétique au format de leaguedashplayerstats (tests/fixtures) : en-têtes et
+# ordre des colonnes de l'API, valeurs tirées de data/nba_data (identifiants
+# séquentiels, colonnes non lues par le client à valeur constante).
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "fixtures",
+    "leaguedashplayerstats_synthetic.json",
+)
+HTML_PAGE_SIZE = 50  # Lignes par page du tableau lu par le scraper Selenium
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        if server.failures_left > 0:
+            server.failures_left -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        if urlparse(self.path).path != "/stats/leaguedashplayerstats":
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fixture():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    with open(FIXTURE, "rb") as f:
+        server.body = f.read()
+    server.requests = []
+    server.failures_left = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/stats"
+
+
+def _records(fixture):
+    result = fixture["resultSets"][0]
+    return [dict(zip(result["headers"], row)) for row in result["rowSet"]]
+
+
+def test_row_layout_maps_onto_player_fields(stand_in, fixture):
+    players = scrapers_stat_api.fetch_nba_stat(base_url=_base_url(stand_in))
+    by_name = {p.Player: p for p in players}
+
+    for record in _records(fixture):
+        player = by_name[record["PLAYER_NAME"]]
+        assert player.Team == record["TEAM_ABBREVIATION"]
+        assert player.Age == int(record["AGE"])
+        assert player.Games_Played == record["GP"]
+        assert player.Wins == record["W"]
+        assert player.Losses == record["L"]
+        assert player.Minutes == pytest.approx(record["MIN"])
+        assert player.Points == pytest.approx(record["PTS"])
+        assert player.Field_Goals_Made == pytest.approx(record["FGM"])
+        assert player.Field_Goals_Attempted == pytest.approx(record["FGA"])
+        assert player.Three_PT_Made == pytest.approx(record["FG3M"])
+        # Pourcentages : fraction dans le JSON, sur 100 à une décimale dans le HTML
+        assert player.FG_Percentage == pytest.approx(record["FG_PCT"], abs=5e-4)
+        assert player.Three_PT_Percentage == pytest.approx(record["FG3_PCT"], abs=5e-4)
+        assert player.FT_Percentage == pytest.approx(record["FT_PCT"], abs=5e-4)
+        assert player.Offensive_Rebounds == pytest.approx(record["OREB"])
+        assert player.Defensive_Rebounds == pytest.approx(record["DREB"])
+        assert player.Total_Rebounds == pytest.approx(record["REB"])
+        assert player.Assists == pytest.approx(record["AST"])
+        assert player.Turnovers == pytest.approx(record["TOV"])
+        assert player.Steals == pytest.approx(record["STL"])
+        assert player.Blocks == pytest.approx(record["BLK"])
+        assert player.Personal_Fouls == pytest.approx(record["PF"])
+        assert player.Plus_Minus == pytest.approx(record["PLUS_MINUS"])
+
+
+def test_whole_season_in_one_request(stand_in, fixture):
+    # L'endpoint n'est pas paginé : toutes les pages du tableau HTML arrivent
+    # dans une seule réponse, sans doublon ni ligne perdue
+    players = scrapers_stat_api.fetch_nba_stat(base_url=_base_url(stand_in))
+    expected = [r["PLAYER_NAME"] for r in _records(fixture)]
+
+    assert len(expected) > 2 * HTML_PAGE_SIZE
+    assert [p.Player for p in players] == expected
+    assert len(stand_in.requests) == 1
+
+    params = parse_qs(urlparse(stand_in.requests[0]).query, keep_blank_values=True)
+    assert params["PerMode"] == ["PerGame"]
+    assert params["Season"] == [scrapers_stat_api.SEASON]
+    assert params["SeasonType"] == ["Regular Season"]
+
+
+def test_retries_server_errors(stand_in, fixture, monkeypatch):
+    monkeypatch.setattr(scrapers_stat_api._get_json.retry, "sleep", lambda s: None)
+    stand_in.failures_left = 2
+
+    players = scrapers_stat_api.fetch_nba_stat(base_url=_base_url(stand_in))
+
+    assert len(players) == len(_records(fixture))
+    assert len(stand_in.requests) == 3
+
+
+def test_client_errors_are_not_retried(stand_in, monkeypatch):
+    monkeypatch.setattr(scrapers_stat_api._get_json.retry, "sleep", lambda s: None)
+
+    with pytest.raises(scrapers_stat_api.requests.HTTPError):
+        scrapers_stat_api.fetch_nba_stat(base_url=_base_url(stand_in) + "/missing")
+    assert len(stand_in.requests) == 1
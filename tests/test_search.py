@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_league  # noqa: E402
+from Scripts.search import SearchIndex  # noqa: E402
+
+# Exemples de la demande : sans accents, début de nom, faute de frappe. Les
+# noms synthétiques (mêmes noms de famille, suffixés) servent de concurrents.
+
+PLAYERS = [
+    "Luka Dončić",
+    "Luka Šamanić",
+    "Victor Wembanyama",
+    "Nikola Jokić",
+    "Nikola Jović",
+    "Giannis Antetokounmpo",
+    "Thanasis Antetokounmpo",
+    "Jaren Jackson Jr.",
+    "Dāvis Bertāns",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    df_stats, _ = make_league(2000, seed=4)
+    return SearchIndex(df_stats["Player"].tolist() + PLAYERS)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("doncic", "Luka Dončić"),
+        ("wemby", "Victor Wembanyama"),
+        ("jokic", "Nikola Jokić"),
+        ("giannis antetokoumpo", "Giannis Antetokounmpo"),  # Faute de frappe
+        ("davis bertans", "Dāvis Bertāns"),
+        ("jaren jackson", "Jaren Jackson Jr."),
+    ],
+)
+def test_best_match_first(index, query, expected):
+    assert index.search(query, 3)[0] == expected
+
+
+def test_limit_and_no_match(index):
+    assert len(index.search("luka", 5)) == 5
+    assert index.search("zzzz") == []
+    assert index.search("") == []
+
+
+def test_duplicate_names_indexed_once():
+    index = SearchIndex(["Luka Dončić", "Luka Doncic", None])
+
+    assert index.search("luka") == ["Luka Dončić"]
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nba_app  # noqa: E402
+from Scripts import serving, storage  # noqa: E402
+
+# Mode partagé : publication d'une version, bascule du pointeur, attache mmap.
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(serving, "SERVING_DIR", str(tmp_path / "serving"))
+    monkeypatch.setattr(serving, "_pointer", {"stat": None, "value": None})
+    return tmp_path
+
+
+def _frame(points):
+    return pd.DataFrame(
+        {
+            "Player": ["Luka Dončić", "Nikola Jokić", "Victor Wembanyama"],
+            "Team": ["LAL", "DEN", "SAS"],
+            "Points": points,
+        }
+    )
+
+
+def _publish(df, mtime):
+    # mtime forcé : deux écritures rapprochées donnent deux versions distinctes
+    path = storage.save_dataset(df, "nba_data")
+    os.utime(path, (mtime, mtime))
+    return serving.publish()
+
+
+def test_publish_and_attach(data_dir):
+    df = _frame([28.1, 26.4, 3.0])
+    version = _publish(df, 1_700_000_000)
+
+    assert serving.read_pointer() == version
+    attached = serving.attach(version)
+    assert isinstance(attached["Player"].dtype, pd.StringDtype)
+    pd.testing.assert_frame_equal(attached, df, check_dtype=False)
+    # Colonne numérique en vue sur le fichier mappé, sans copie
+    assert not attached["Points"].to_numpy().flags.owndata
+
+
+def test_new_version_switches_pointer_and_prunes(data_dir):
+    versions = [
+        _publish(_frame([float(i), 1.0, 2.0]), 1_700_000_000 + i)
+        for i in range(serving.KEEP_VERSIONS + 2)
+    ]
+
+    assert len(set(versions)) == len(versions)
+    assert serving.read_pointer() == versions[-1]
+    kept = [v for v in versions if os.path.exists(serving.published_path(v))]
+    assert kept == versions[-serving.KEEP_VERSIONS :]
+    np.testing.assert_array_equal(
+        serving.attach(versions[-1])["Points"], [len(versions) - 1, 1.0, 2.0]
+    )
+
+
+def test_refresh_request_taken_once(data_dir):
+    assert not serving.take_refresh_request()
+    serving.request_refresh()
+
+    assert serving.take_refresh_request()
+    assert not serving.take_refresh_request()
+
+
+def test_worker_follows_pointer(data_dir, monkeypatch):
+    monkeypatch.setattr(nba_app.app, "testing", True)
+    monkeypatch.setattr(nba_app, "SHARED_SERVING", True)
+    monkeypatch.setattr(nba_app, "POINTER_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(nba_app, "_pointer_state", {"checked_at": 0.0})
+    first = _publish(_frame([28.1, 26.4, 3.0]), 1_700_000_000)
+    monkeypatch.setattr(nba_app, "DATASET", nba_app.load_snapshot())
+    client = nba_app.app.test_client()
+    assert nba_app.DATASET.version == first
+
+    # Un autre processus publie une nouvelle version : bascule à la requête suivante
+    second = _publish(_frame([30.0, 26.4, 3.0]), 1_700_000_001)
+    body = client.get("/api/player?name=Luka Dončić").get_json()
+
+    assert nba_app.DATASET.version == second
+    assert body["Points"] == 30.0
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_league  # noqa: E402
+from Scripts import teams  # noqa: E402
+from Scripts.dataset import DatasetSnapshot  # noqa: E402
+from Scripts.merge_data import merge_salaries  # noqa: E402
+from Scripts.utils_nba import compute_metrics  # noqa: E402
+
+# Les agrégats vectorisés (bincount) doivent égaler un groupby pandas.
+
+
+@pytest.fixture
+def snapshot():
+    df_stats, df_salary = make_league(400, seed=6)
+    df = compute_metrics(merge_salaries(df_stats, df_salary))
+    df.loc[[3, 30], "Team"] = np.nan  # Sans équipe : exclus des agrégats
+    return DatasetSnapshot(df, "t1")
+
+
+def reference_teams(df):
+    df = df.dropna(subset=["Team"]).assign(
+        Known_th=lambda d: d["Salary_th"].where(d["Salary"] > 0, 0),
+        Underpaid=lambda d: d["Indicateur"].str.contains("Underpaid"),
+        Overpaid=lambda d: d["Indicateur"].str.contains("Overpaid"),
+    )
+    grouped = df.groupby("Team").agg(
+        Players=("Player", "size"),
+        Payroll=("Salary", "sum"),
+        Projected_Value=("Known_th", "sum"),
+        Total_Performance=("Performance_Score", "sum"),
+        Underpaid=("Underpaid", "sum"),
+        Overpaid=("Overpaid", "sum"),
+    )
+    grouped["Surplus"] = grouped["Projected_Value"] - grouped["Payroll"]
+    return grouped
+
+
+def test_aggregates_match_groupby(snapshot):
+    expected = reference_teams(snapshot.df)
+    rows = pd.DataFrame(teams.list_teams(snapshot)).set_index("Team")
+
+    assert sorted(rows.index) == sorted(expected.index)
+    rows = rows.loc[expected.index]
+    for column in ("Players", "Underpaid", "Overpaid"):
+        assert rows[column].tolist() == expected[column].tolist()
+    for column in ("Payroll", "Projected_Value", "Surplus", "Total_Performance"):
+        np.testing.assert_allclose(rows[column], expected[column], rtol=1e-12)
+
+
+def test_sorted_by_surplus(snapshot):
+    surplus = [row["Surplus"] for row in teams.list_teams(snapshot)]
+
+    assert surplus == sorted(surplus, reverse=True)
+    with pytest.raises(KeyError):
+        teams.list_teams(snapshot, "Bogus")
+
+
+def test_team_detail_top_contributors(snapshot):
+    df = snapshot.df
+    detail = teams.team_detail(snapshot, "lal", top=3)
+
+    expected = df[df["Team"] == "LAL"].nlargest(3, "Performance_Score")
+    assert [p["id"] for p in detail["Top_Contributors"]] == expected.index.tolist()
+    assert teams.team_detail(snapshot, "XYZ") is None
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_league  # noqa: E402
+from Scripts import whatif  # noqa: E402
+from Scripts.dataset import DatasetSnapshot  # noqa: E402
+from Scripts.merge_data import merge_salaries  # noqa: E402
+from Scripts.utils_nba import compute_metrics  # noqa: E402
+
+# Le scénario par défaut doit redonner les colonnes de compute_metrics.
+
+
+@pytest.fixture
+def snapshot():
+    df_stats, df_salary = make_league(300, seed=2)
+    return DatasetSnapshot(compute_metrics(merge_salaries(df_stats, df_salary)), "w1")
+
+
+def test_default_scenario_matches_compute_metrics(snapshot):
+    _, result = whatif.run_scenario(snapshot)
+
+    df = snapshot.df
+    # Produit matrice-vecteur : le score ne diffère que de l'arrondi flottant
+    np.testing.assert_allclose(
+        result["Performance_Score"], df["Performance_Score"], rtol=1e-12
+    )
+    for column in ("Salary_th", "Offensive_Impact", "Defensive_Impact"):
+        np.testing.assert_array_equal(result[column], df[column].to_numpy(dtype=float))
+    assert result["Indicateur"].tolist() == df["Indicateur"].tolist()
+
+
+def test_weights_change_the_ranking(snapshot):
+    _, result = whatif.run_scenario(snapshot, {"weights": {"Points": 100}})
+
+    assert not np.array_equal(result["Salary_th"], snapshot.df["Salary_th"])
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        [1, 2],
+        {"Bogus": 1},
+        {"weights": {"Points": -1}},
+        {"weights": {"Points": "10"}},
+        {"minutes_threshold": 0},
+    ],
+)
+def test_invalid_scenario(snapshot, overrides):
+    with pytest.raises(whatif.ScenarioError):
+        whatif.run_scenario(snapshot, overrides)